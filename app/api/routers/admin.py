@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.auth import require_admin
+from app.core import profiling
+
+router = APIRouter(tags=["Admin"], dependencies=[Depends(require_admin)])
+
+@router.get("/profiles")
+async def list_profiles():
+    """
+    Recent request profiles on this worker, newest first (without stacks).
+    """
+    return [
+        {k: v for k, v in p.items() if k != "stacks"}
+        for p in reversed(profiling.profiles)
+    ]
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """
+    Full profile: span timeline plus folded stack samples.
+    """
+    for p in profiling.profiles:
+        if p["id"] == profile_id:
+            return p
+    raise HTTPException(status_code=404, detail="Profile not found")
@@ -1,13 +1,15 @@
 import json
 import base64
+import httpx
 import urllib.parse
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import RedirectResponse
-from google_auth_oauthlib.flow import Flow
 from app.core.config import settings
 from app.core.database import get_database
+from app.core.http import get_http_client
 from app.core.security import create_access_token, create_refresh_token, decode_refresh_token
 from app.core.auth import get_current_user
 from app.models.schemas import RefreshTokenRequest
@@ -20,29 +22,64 @@ os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
 
 SCOPES = ['openid', 'https://www.googleapis.com/auth/userinfo.email', 'https://www.googleapis.com/auth/userinfo.profile']
 REDIRECT_URI = f"{settings.API_BASE_URL}/api/v1/auth/callback"
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+USERINFO_URI = "https://www.googleapis.com/oauth2/v2/userinfo"
 
+@lru_cache(maxsize=1)
 def _build_client_config():
     return {
         "web": {
             "client_id": settings.GOOGLE_CLIENT_ID,
             "client_secret": settings.GOOGLE_CLIENT_SECRET,
             "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
+            "token_uri": TOKEN_URI,
             "redirect_uris": [REDIRECT_URI],
         }
     }
 
+@lru_cache(maxsize=1)
+def _build_flow():
+    """
+    Built once per worker and only used to generate authorization urls.
+    The token exchange in /callback goes through the async http client instead,
+    which is also why no pkce verifier is generated here.
+    """
+    # google_auth_oauthlib pulls in requests-oauthlib and google.auth; only import it when logging in
+    from google_auth_oauthlib.flow import Flow
+    return Flow.from_client_config(
+        _build_client_config(),
+        scopes=SCOPES,
+        redirect_uri=REDIRECT_URI,
+        autogenerate_code_verifier=False,
+    )
+
+async def _exchange_code(code: str) -> dict:
+    client_config = _build_client_config()["web"]
+    response = await get_http_client().post(TOKEN_URI, data={
+        "code": code,
+        "client_id": client_config["client_id"],
+        "client_secret": client_config["client_secret"],
+        "redirect_uri": REDIRECT_URI,
+        "grant_type": "authorization_code",
+    })
+    response.raise_for_status()
+    return response.json()
+
+async def _fetch_user_info(access_token: str) -> dict:
+    response = await get_http_client().get(
+        USERINFO_URI,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    response.raise_for_status()
+    return response.json()
+
 @router.get("/login")
 async def login(redirect_url: Optional[str] = None):
     """
     Initiates the Google OAuth flow.
     Accepts an optional redirect_url that will receive tokens as query params on callback.
     """
-    flow = Flow.from_client_config(
-        _build_client_config(),
-        scopes=SCOPES,
-        redirect_uri=REDIRECT_URI
-    )
+    flow = _build_flow()
 
     # encode redirect_url into oauth state so it survives the round-trip
     state_data = json.dumps({"redirect_url": redirect_url or ""})
@@ -76,18 +113,14 @@ async def callback(request: Request, db = Depends(get_database)):
         except Exception:
             pass
 
-    flow = Flow.from_client_config(
-        _build_client_config(),
-        scopes=SCOPES,
-        redirect_uri=REDIRECT_URI
-    )
-
-    # exchange code for token
-    flow.fetch_token(code=code)
-
-    # get user info
-    session = flow.authorized_session()
-    user_info = session.get('https://www.googleapis.com/oauth2/v2/userinfo').json()
+    # exchange code for token and get user info without blocking the event loop
+    try:
+        token = await _exchange_code(code)
+        user_info = await _fetch_user_info(token["access_token"])
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Timed out talking to Google")
+    except (httpx.HTTPError, KeyError):
+        raise HTTPException(status_code=400, detail="Failed to exchange authorization code")
 
     user_id = user_info.get("id")
     email = user_info.get("email")
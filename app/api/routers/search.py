@@ -1,5 +1,9 @@
-from fastapi import APIRouter, Depends
+import time
+from fastapi import APIRouter, Depends, Request
+from app.core import capture
 from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.responses import fast_response
 from app.models.schemas import AutofillRequest, AutofillResponse, WebsiteSuggestion
 from app.services import vector_service
 
@@ -8,6 +12,7 @@ router = APIRouter(tags=["Search"])
 @router.post("/autofill", response_model=AutofillResponse)
 async def autofill_form(
     request: AutofillRequest,
+    http_request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -17,6 +22,10 @@ async def autofill_form(
     - Returns suggested values.
     """
     user_id = current_user["user_id"]
+    started = time.perf_counter()
     results = await vector_service.search_autofill(user_id, request)
-    print(f"[autofill] results: {results}")
+    capture.record_autofill(user_id, request, time.perf_counter() - started)
+    if settings.FAST_RESPONSES:
+        # search_autofill already builds {"website", "fields"} dicts in the response shape
+        return fast_response(http_request, {"suggestions": results})
     return {"suggestions": results}
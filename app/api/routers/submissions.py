@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query
+import time
+import hashlib
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, Request, Response
 from typing import List, Optional
+from app.core import capture
 from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.profiling import span
+from app.core.responses import fast_response, response_media_type
 from app.models.schemas import SubmissionCreate, SubmissionResponse, SubmissionSummary
-from app.services import vector_service
+from app.services import vector_service, sync_service
 from app.core.database import get_database
 from datetime import datetime
 from uuid import uuid4
@@ -17,10 +23,78 @@ def _with_latest(doc: dict) -> dict:
     return doc
 
 
+def _submission_payload(doc: dict) -> dict:
+    """a mongo doc shaped exactly like SubmissionResponse, for the fast response path."""
+    return {
+        "id": doc["id"],
+        "user_id": doc["user_id"],
+        "website": doc["website"],
+        "path": doc["path"],
+        "form_id": doc.get("form_id"),
+        "data": doc.get("data", {}),
+        "latest": doc.get("latest", {}),
+        "timestamp": doc["timestamp"],
+    }
+
+
+SUMMARY_PROJECTION = {"_id": 0, "id": 1, "user_id": 1, "website": 1, "path": 1, "form_id": 1, "timestamp": 1}
+
+# fields needed to compute an etag; covered by the submission_etag index
+ETAG_PROJECTION = {"_id": 0, "version": 1, "timestamp": 1}
+
+
+def _etag(doc: dict, variant: str) -> str:
+    """
+    Derived from the per-document version (or the timestamp for documents
+    written before versions existed) plus the requested projection, since
+    different fields= / latest_only= views of one version are different bodies.
+    """
+    version = doc.get("version")
+    if version is None:
+        timestamp = doc.get("timestamp")
+        version = f"t{int(timestamp.timestamp() * 1_000_000)}" if timestamp else "0"
+    suffix = hashlib.md5(variant.encode()).hexdigest()[:8] if variant else "all"
+    return f'"{version}-{suffix}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # compare weakly: proxies may add W/ to what we sent
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return etag in candidates
+
+
+async def _find_detail(db, query: dict, keys: Optional[List[str]], latest_only: bool) -> Optional[dict]:
+    """
+    read only what the response needs: the requested keys, and only their last value if latest_only.
+    Requested keys are compared as values and never become field paths, so any key text is safe.
+    """
+    base = {**SUMMARY_PROJECTION, "version": 1}
+    if not keys and not latest_only:
+        return await db.submissions.find_one(query, {**base, "data": 1})
+
+    entries = {"$objectToArray": {"$ifNull": ["$data", {}]}}
+    if keys:
+        # $literal: a key starting with "$" would otherwise be read as a field path
+        entries = {"$filter": {"input": entries, "cond": {"$in": ["$$this.k", {"$literal": keys}]}}}
+    if latest_only:
+        # slice every (requested) array to its last element server-side
+        entries = {"$map": {"input": entries, "in": {"k": "$$this.k", "v": {"$slice": ["$$this.v", -1]}}}}
+    pipeline = [
+        {"$match": query},
+        {"$limit": 1},
+        {"$project": {**base, "data": {"$arrayToObject": entries}}},
+    ]
+    docs = await db.submissions.aggregate(pipeline).to_list(length=1)
+    return docs[0] if docs else None
+
+
 @router.post("/", response_model=SubmissionResponse)
 async def ingest_submission(
     submission: SubmissionCreate,
     background_tasks: BackgroundTasks,
+    request: Request,
     current_user: dict = Depends(get_current_user),
     db = Depends(get_database)
 ):
@@ -31,6 +105,7 @@ async def ingest_submission(
     - Triggers asynchronous vector embedding.
     """
     user_id = current_user["user_id"]
+    started = time.perf_counter()
 
     # composite key for uniqueness
     filter_doc = {
@@ -54,21 +129,32 @@ async def ingest_submission(
             "path": submission.path,
             "form_id": submission.form_id,
         },
-        "$set": {"timestamp": datetime.utcnow()},
+        "$set": {
+            "timestamp": datetime.utcnow(),
+        },
     }
 
-    await db.submissions.update_one(filter_doc, update_doc, upsert=True)
+    with span("submissions.upsert"):
+        async with sync_service.versioned_write(db, user_id) as version:
+            # $max: a concurrent write to the same form may have taken a later version and landed first
+            update_doc["$max"] = {"version": version}
+            await db.submissions.update_one(filter_doc, update_doc, upsert=True)
 
     # fetch the final merged document to return
-    submission_doc = await db.submissions.find_one(filter_doc)
+    with span("submissions.find_merged"):
+        submission_doc = await db.submissions.find_one(filter_doc)
 
     # background vector ingestion (uses original submission data, not merged)
     background_tasks.add_task(vector_service.ingest_submission, user_id, submission)
+    capture.record_submission(user_id, submission, time.perf_counter() - started)
 
+    if settings.FAST_RESPONSES:
+        return fast_response(request, _submission_payload(_with_latest(submission_doc)))
     return _with_latest(submission_doc)
 
 @router.get("/", response_model=List[SubmissionSummary])
 async def list_submissions(
+    request: Request,
     website: Optional[str] = Query(None, description="Filter by website URL"),
     current_user: dict = Depends(get_current_user),
     db = Depends(get_database)
@@ -81,24 +167,58 @@ async def list_submissions(
     if website:
         query["website"] = website
 
-    cursor = db.submissions.find(query, {"data": 0})
+    cursor = db.submissions.find(query, SUMMARY_PROJECTION)
     submissions = await cursor.to_list(length=100)
+    if settings.FAST_RESPONSES:
+        return fast_response(request, [{**s, "form_id": s.get("form_id")} for s in submissions])
     return submissions
 
 @router.get("/{submission_id}", response_model=SubmissionResponse)
 async def get_submission_detail(
     submission_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated keys to return instead of all of data"),
+    latest_only: bool = Query(False, description="Only return the latest value per key; data is left empty"),
     current_user: dict = Depends(get_current_user),
     db = Depends(get_database)
 ):
     """
     Get the full data for a specific submission by ID.
+    - Responses carry an ETag; send it back as If-None-Match to get a 304 when nothing changed.
+    - `fields` and `latest_only` narrow what is read from Mongo and returned.
     """
     user_id = current_user["user_id"]
-    submission = await db.submissions.find_one({"id": submission_id, "user_id": user_id})
+    query = {"id": submission_id, "user_id": user_id}
+    keys = sorted({k.strip() for k in fields.split(",") if k.strip()}) if fields else None
+    variant = f"{','.join(keys or [])}|{int(latest_only)}" if keys or latest_only else ""
+    # a msgpack body of the same view is a different representation
+    media_type = response_media_type(request) if settings.FAST_RESPONSES else "application/json"
+    if media_type != "application/json":
+        variant = f"{variant}|{media_type}"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # cheap index-only read to answer polls without touching data
+        meta = await db.submissions.find_one(query, ETAG_PROJECTION)
+        if not meta:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        etag = _etag(meta, variant)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept"})
+
+    submission = await _find_detail(db, query, keys, latest_only)
 
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    return _with_latest(submission)
+    submission.setdefault("data", {})
+    _with_latest(submission)
+    if latest_only:
+        submission["data"] = {}
+    headers = {"ETag": _etag(submission, variant), "Cache-Control": "private, no-cache", "Vary": "Accept"}
 
+    if settings.FAST_RESPONSES:
+        return fast_response(request, _submission_payload(submission), headers=headers)
+    response.headers.update(headers)
+    return submission
@@ -0,0 +1,36 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.responses import fast_response
+from app.models.schemas import SyncResponse
+from app.services import sync_service
+
+router = APIRouter(tags=["Sync"])
+
+@router.get("/", response_model=SyncResponse)
+async def sync_submissions(
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=0, description="cursor from the previous sync; omit for a full snapshot"),
+    embeddings: bool = Query(True, description="include key embeddings for the returned submissions"),
+    quantization: Literal["int8", "binary", "float32"] = Query("int8", description="embedding encoding"),
+    current_user: dict = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    Delta sync for client-side autofill.
+    - Without a cursor: snapshot of every submission's latest values plus key embeddings.
+    - With a cursor: only submissions changed and ids deleted since then.
+    - If `full` is true (or `model` changed), replace local state instead of merging.
+    """
+    payload = await sync_service.build_sync(
+        db,
+        current_user["user_id"],
+        cursor=cursor,
+        embeddings=embeddings,
+        quantization=quantization,
+    )
+    if settings.FAST_RESPONSES:
+        return fast_response(request, payload)
+    return payload
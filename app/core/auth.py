@@ -1,7 +1,8 @@
 from fastapi import HTTPException, Security, status, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token, decode_admin_token
 from app.core.database import get_database
+from app.core.profiling import span
 
 security = HTTPBearer()
 
@@ -11,7 +12,8 @@ async def get_current_user(
 ):
     token = credentials.credentials
     try:
-        payload = decode_access_token(token)
+        with span("auth.decode_token"):
+            payload = decode_access_token(token)
         if payload is None:
              raise ValueError("Invalid Token")
              
@@ -20,7 +22,8 @@ async def get_current_user(
              raise ValueError("Token missing user_id")
              
         # fetch user from db to ensure validity
-        user = await db.users.find_one({"user_id": user_id})
+        with span("auth.user_lookup"):
+            user = await db.users.find_one({"user_id": user_id})
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
             
@@ -32,3 +35,12 @@ async def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+async def require_admin(credentials: HTTPAuthorizationCredentials = Security(security)):
+    payload = decode_admin_token(credentials.credentials)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required",
+        )
+    return payload
@@ -0,0 +1,199 @@
+"""
+Optional traffic capture for load testing (CAPTURE_ENABLED).
+
+Records the shape of autofill and submission requests, never their values:
+user ids and website/path/form_id are salted hashes, submission values are
+reduced to their lengths, and field names are kept since they drive the
+semantic search. Records go through a bounded queue to a writer thread that
+appends gzip'd JSON lines and rotates files, so the request path never
+touches the disk. Replay them with benchmarks/replay.py.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_queue: "queue.Queue[dict]" = queue.Queue(maxsize=10000)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+dropped = 0
+_STOP = object()
+
+
+def _hash(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    salt = settings.CAPTURE_SALT or settings.SECRET_KEY
+    return hashlib.sha256(f"{salt}:{value}".encode()).hexdigest()[:16]
+
+
+def _enqueue(record: dict):
+    global _writer, dropped
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="capture-writer", daemon=True)
+                _writer.start()
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        # never slow requests down for the sake of capture
+        dropped += 1
+
+
+def record_autofill(user_id: str, request, duration: float, status_code: int = 200):
+    if not settings.CAPTURE_ENABLED:
+        return
+    _enqueue({
+        "ts": time.time(),
+        "endpoint": "autofill",
+        "user": _hash(user_id),
+        "keys": request.keys,
+        "website": _hash(request.website),
+        "path": _hash(request.path),
+        "form_id": _hash(request.form_id),
+        "threshold": request.threshold,
+        "multiple": request.multiple,
+        "limit": request.limit,
+        "duration_ms": round(duration * 1000, 3),
+        "status": status_code,
+    })
+
+
+def record_submission(user_id: str, submission, duration: float, status_code: int = 200):
+    if not settings.CAPTURE_ENABLED:
+        return
+    _enqueue({
+        "ts": time.time(),
+        "endpoint": "submission",
+        "user": _hash(user_id),
+        "website": _hash(submission.website),
+        "path": _hash(submission.path),
+        "form_id": _hash(submission.form_id),
+        "fields": {k: len(str(v)) for k, v in submission.data.items()},
+        "duration_ms": round(duration * 1000, 3),
+        "status": status_code,
+    })
+
+
+class _RotatingGzipWriter:
+    """
+    Both limits are on-disk (compressed) sizes: max_bytes per file, checked
+    against what the compressor has flushed so far, and max_total_bytes for
+    everything in the directory.
+    """
+
+    # files modified more recently than this are assumed to be open in another worker
+    MIN_ACTIVE_SECONDS = 60
+
+    def __init__(self, directory: Path, max_bytes: int, max_files: int, max_total_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.max_total_bytes = max_total_bytes
+        self._file = None
+        self._path: Optional[Path] = None
+        self._opened_at = 0.0
+        self._interval = 0.0
+
+    def write(self, line: bytes):
+        if self._file is None or self._file.fileobj.tell() >= self.max_bytes:
+            self._rotate()
+        self._file.write(line)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            # writes the gzip trailer; without it readers stop at the last complete block
+            self._file.close()
+            self._file = None
+
+    def _rotate(self):
+        now = time.time()
+        if self._file is not None:
+            self._file.close()
+            # how long a file lasts here; other workers' open files were written to about as recently
+            self._interval = now - self._opened_at
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"capture-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.jsonl.gz"
+        self._path = self.directory / name
+        self._file = gzip.open(self._path, "ab")
+        self._opened_at = now
+        self._prune()
+
+    def _prune(self):
+        """
+        Cap the whole directory, not just this process: files of restarted
+        workers (new pids) would otherwise pile up forever. Oldest go first,
+        and files written to within the last rotation interval are left alone
+        since another worker may still have them open.
+        """
+        active_since = time.time() - max(self.MIN_ACTIVE_SECONDS, self._interval)
+        files = []
+        for path in self.directory.glob("capture-*.jsonl.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # another worker pruned it first
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        count = len(files)
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in files:
+            if count <= self.max_files and total <= self.max_total_bytes:
+                break
+            if path == self._path or mtime >= active_since:
+                continue
+            path.unlink(missing_ok=True)
+            count -= 1
+            total -= size
+
+
+def _write_loop():
+    writer = _RotatingGzipWriter(
+        Path(settings.CAPTURE_DIR),
+        max_bytes=settings.CAPTURE_MAX_BYTES,
+        max_files=settings.CAPTURE_MAX_FILES,
+        max_total_bytes=settings.CAPTURE_MAX_TOTAL_BYTES,
+    )
+    while True:
+        record = _queue.get()
+        if record is _STOP:
+            writer.close()
+            return
+        try:
+            writer.write((json.dumps(record, separators=(",", ":")) + "\n").encode())
+            if _queue.empty():
+                writer.flush()
+        except Exception as e:
+            logger.warning(f"[capture] failed to write record: {e}")
+
+
+def close(timeout: float = 5.0):
+    """drain queued records and finish the current file; called from the app's lifespan at shutdown."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is None:
+        return
+    try:
+        # queued after every pending record, so those are written first
+        _queue.put(_STOP, timeout=timeout)
+    except queue.Full:
+        logger.warning("[capture] writer is stuck, last capture file may be truncated")
+        return
+    writer.join(timeout)
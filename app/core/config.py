@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -13,6 +14,63 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     API_BASE_URL: str
 
+    # startup maintenance runs in one process; the rest wait for it up to this long
+    STARTUP_LEASE_TTL_SECONDS: int = 60
+    STARTUP_WAIT_TIMEOUT_SECONDS: int = 300
+
+    # key into vector_service.EMBEDDING_MODELS
+    EMBEDDING_MODEL: str = "bge-small-en"
+
+    # qdrant calls: per-call timeouts, circuit breaker and the autofill time budget
+    QDRANT_TIMEOUT_SECONDS: float = 2.0
+    QDRANT_SETUP_TIMEOUT_SECONDS: float = 10.0
+    QDRANT_SEARCH_CONCURRENCY: int = 8
+    QDRANT_BREAKER_FAILURE_RATE: float = 0.5
+    QDRANT_BREAKER_MIN_CALLS: int = 10
+    QDRANT_BREAKER_WINDOW_SECONDS: float = 30
+    QDRANT_BREAKER_OPEN_SECONDS: float = 15
+    AUTOFILL_DEADLINE_SECONDS: float = 3.0
+    AUTOFILL_CACHE_SIZE: int = 10000
+    AUTOFILL_CACHE_TTL_SECONDS: float = 600
+    KEY_VECTOR_CACHE_SIZE: int = 20000
+
+    # "per_field" stores one vector per form field, "per_key" one per distinct key per user
+    VECTOR_STORAGE: Literal["per_field", "per_key"] = "per_field"
+    KEY_SEARCH_LIMIT: int = 5
+    # most recent submissions read per autofill to expand per_key hits into values
+    KEY_EXPAND_LIMIT: int = 100
+
+    # skip response_model validation on hot endpoints and encode with orjson when installed;
+    # msgpack is served to clients that send Accept: application/msgpack
+    FAST_RESPONSES: bool = False
+    MSGPACK_RESPONSES: bool = True
+
+    # per-request profiling: X-Profile: <admin token> or random sampling
+    PROFILING_ENABLED: bool = True
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILE_BUFFER_SIZE: int = 100
+    PROFILE_MAX_STACKS: int = 200
+    ADMIN_TOKEN_EXPIRE_HOURS: int = 12
+
+    # anonymized request-shape capture for replay (see app/core/capture.py)
+    CAPTURE_ENABLED: bool = False
+    CAPTURE_DIR: str = "captures"
+    CAPTURE_MAX_BYTES: int = 50_000_000
+    CAPTURE_MAX_FILES: int = 20
+    CAPTURE_MAX_TOTAL_BYTES: int = 1_000_000_000
+    CAPTURE_SALT: str = ""
+
+    # load the embedding model during startup instead of on the first autofill
+    WARM_UP_EMBEDDER: bool = True
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+
+    # pooled outbound http client
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+
     model_config = SettingsConfigDict(env_file=".env")
 
 settings = Settings()
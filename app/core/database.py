@@ -1,20 +1,66 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from qdrant_client import AsyncQdrantClient
 from app.core.config import settings
 
-# mongodb setup
-mongo_client = AsyncIOMotorClient(settings.MONGO_URI)
-db = mongo_client[settings.MONGO_DB_NAME]
+# clients are built on first use so importing this module stays cheap
+# and each uvicorn worker creates its own after fork
+_mongo_client = None
+_qdrant_client = None
+
+
+def get_mongo_client():
+    global _mongo_client
+    if _mongo_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _mongo_client = AsyncIOMotorClient(settings.MONGO_URI)
+    return _mongo_client
+
+
+def get_db():
+    return get_mongo_client()[settings.MONGO_DB_NAME]
+
+
+def get_qdrant():
+    global _qdrant_client
+    if _qdrant_client is None:
+        from qdrant_client import AsyncQdrantClient
+        if settings.QDRANT_URL == ":memory:":
+            # local in-process mode, handy for development and benchmarks
+            _qdrant_client = AsyncQdrantClient(location=":memory:")
+        else:
+            _qdrant_client = AsyncQdrantClient(
+                url=settings.QDRANT_URL,
+                api_key=settings.QDRANT_API_KEY,
+            )
+    return _qdrant_client
 
-# qdrant setup
-# using fastembed by default
-qdrant_client = AsyncQdrantClient(
-    url=settings.QDRANT_URL,
-    api_key=settings.QDRANT_API_KEY,
-)
 
 async def get_database():
-    return db
+    return get_db()
 
 async def get_qdrant_client():
-    return qdrant_client
+    return get_qdrant()
+
+
+async def ping_mongo():
+    await get_db().command("ping")
+
+async def ping_qdrant():
+    await get_qdrant().get_collections()
+
+
+def use_clients(mongo_client=None, qdrant_client=None):
+    """swap in pre-built clients (e.g. local stand-ins for benchmarks) before first use."""
+    global _mongo_client, _qdrant_client
+    if mongo_client is not None:
+        _mongo_client = mongo_client
+    if qdrant_client is not None:
+        _qdrant_client = qdrant_client
+
+
+async def close_clients():
+    global _mongo_client, _qdrant_client
+    if _mongo_client is not None:
+        _mongo_client.close()
+        _mongo_client = None
+    if _qdrant_client is not None:
+        await _qdrant_client.close()
+        _qdrant_client = None
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+LEASES_COLLECTION = "leases"
+MARKERS_COLLECTION = "maintenance"
+
+
+class LeaseUnavailable(Exception):
+    """raised by `async with Lease(...)` when another owner holds the lease."""
+
+
+def default_owner() -> str:
+    """identifies this process across pods and uvicorn workers."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+class Lease:
+    """
+    Mongo-backed lease: at most one live holder per name.
+    The holder renews it from a heartbeat task; if the process dies the lease
+    simply expires after ttl_seconds and someone else can take it over.
+    Expiry is judged on the Mongo server's clock ($currentDate), never a pod's
+    own, so clock skew between pods can't produce two holders.
+    `async with` raises LeaseUnavailable instead of entering without the lease.
+    """
+
+    def __init__(self, db, name: str, ttl_seconds: float = 30, owner: Optional[str] = None):
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.owner = owner or default_owner()
+        self.held = False
+        self.lost = False
+        self._collection = db[LEASES_COLLECTION]
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # monotonic time taken just before the last write that (re)confirmed the lease
+        self._confirmed_at: Optional[float] = None
+
+    @property
+    def expired(self) -> bool:
+        """true once a full ttl has passed since the lease was last confirmed; others may hold it by now."""
+        return self._confirmed_at is None or time.monotonic() - self._confirmed_at >= self.ttl.total_seconds()
+
+    async def acquire(self) -> bool:
+        started = time.monotonic()
+        try:
+            # stamp the server's clock on the lease and read it back with the current holder
+            current = await self._collection.find_one_and_update(
+                {"_id": self.name},
+                {"$currentDate": {"checked_at": True}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # two first upserts raced on _id; the other one created it
+            return False
+
+        owner, renewed_at = current.get("owner"), current.get("renewed_at")
+        if owner not in (None, self.owner) and renewed_at is not None:
+            if renewed_at + timedelta(milliseconds=current.get("ttl_ms", 0)) > current["checked_at"]:
+                return False
+
+        # compare-and-swap on what we just read: every write changes the token,
+        # so if anyone took or renewed it meanwhile, we lose
+        result = await self._collection.update_one(
+            {"_id": self.name, "owner": owner, "token": current.get("token")},
+            {
+                "$set": {"owner": self.owner, "token": uuid4().hex, "ttl_ms": int(self.ttl.total_seconds() * 1000)},
+                "$currentDate": {"renewed_at": True, "acquired_at": True},
+            },
+        )
+        if result.matched_count != 1:
+            return False
+
+        self._confirmed_at = started
+        self.held = True
+        self.lost = False
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        return True
+
+    async def renew(self) -> bool:
+        started = time.monotonic()
+        result = await self._collection.update_one(
+            {"_id": self.name, "owner": self.owner},
+            {"$set": {"token": uuid4().hex}, "$currentDate": {"renewed_at": True}},
+        )
+        if result.matched_count != 1:
+            return False
+        self._confirmed_at = started
+        return True
+
+    async def release(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self.held:
+            self.held = False
+            await self._collection.delete_one({"_id": self.name, "owner": self.owner})
+
+    async def _heartbeat(self):
+        interval = self.ttl.total_seconds() / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self.renew()
+            except Exception as e:
+                # transient mongo errors: keep trying, but only until the lease has run out
+                logger.warning(f"[lease] heartbeat failed for '{self.name}': {e}")
+                renewed = not self.expired
+            if not renewed:
+                logger.warning(f"[lease] lost lease '{self.name}' (owner {self.owner})")
+                self.held = False
+                self.lost = True
+                self._heartbeat_task = None
+                return
+
+    async def __aenter__(self):
+        if not await self.acquire():
+            raise LeaseUnavailable(f"lease '{self.name}' is held by another owner")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+
+async def is_done(db, name: str, version: str) -> bool:
+    marker = await db[MARKERS_COLLECTION].find_one({"_id": name})
+    return bool(marker) and marker.get("version") == version
+
+
+async def run_once(
+    db,
+    name: str,
+    version: str,
+    task: Callable[[], Awaitable[None]],
+    ttl_seconds: float = 60,
+    wait_timeout: float = 300,
+    poll_interval: float = 1,
+) -> bool:
+    """
+    Run `task` in exactly one process for the given (name, version).
+    The winner runs it under a lease and writes a ready marker; everyone else
+    waits for the marker (or for the lease to expire and takes over).
+    Returns True if the task is known to be done when this returns.
+    """
+    if await is_done(db, name, version):
+        return True
+
+    lease = Lease(db, name, ttl_seconds=ttl_seconds)
+    deadline = asyncio.get_running_loop().time() + wait_timeout
+
+    while True:
+        if await lease.acquire():
+            try:
+                # another process may have finished between our check and the acquire
+                if await is_done(db, name, version):
+                    return True
+
+                logger.info(f"[lease] running '{name}' ({version}) as {lease.owner}")
+                await task()
+
+                # confirm we still hold it: the heartbeat only notices a lost lease every ttl/3
+                if lease.lost or not await lease.renew():
+                    # someone else may be re-running it; let them write the marker
+                    logger.warning(f"[lease] '{name}' finished after its lease was lost")
+                    return False
+
+                await db[MARKERS_COLLECTION].update_one(
+                    {"_id": name},
+                    {"$set": {"version": version, "completed_at": datetime.utcnow(), "owner": lease.owner}},
+                    upsert=True,
+                )
+                return True
+            finally:
+                await lease.release()
+
+        if wait_timeout <= 0:
+            # caller doesn't want to wait for whoever holds it
+            return False
+
+        await asyncio.sleep(poll_interval)
+        if await is_done(db, name, version):
+            return True
+        if asyncio.get_running_loop().time() >= deadline:
+            logger.warning(f"[lease] timed out waiting for '{name}' ({version}), continuing without it")
+            return False
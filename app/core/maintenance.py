@@ -0,0 +1,125 @@
+import logging
+from app.core.config import settings
+from app.core.lease import run_once
+from app.services import sync_service, vector_service
+
+logger = logging.getLogger(__name__)
+
+# bump whenever the migrations below change so they run again on the next deploy
+STARTUP_MAINTENANCE_VERSION = "2026-10-19.3"
+
+
+async def migrate_submissions(db):
+    # migrate: backfill path and form_id (handles both missing and null)
+    await db.submissions.update_many(
+        {"path": {"$in": [None]}},
+        {"$set": {"path": "/"}}
+    )
+    await db.submissions.update_many(
+        {"path": {"$exists": False}},
+        {"$set": {"path": "/"}}
+    )
+    await db.submissions.update_many(
+        {"form_id": {"$exists": False}},
+        {"$set": {"form_id": None}}
+    )
+
+    # migrate: convert all string data values to single-element arrays
+    async for doc in db.submissions.find({"data": {"$exists": True}}):
+        updates = {}
+        if doc.get("data"):
+            for key, value in doc["data"].items():
+                if not isinstance(value, list):
+                    updates[f"data.{key}"] = [str(value)]
+        if updates:
+            await db.submissions.update_one(
+                {"_id": doc["_id"]},
+                {"$set": updates}
+            )
+
+    # migrate: deduplicate docs that share the same composite key
+    pipeline = [
+        {"$group": {
+            "_id": {"user_id": "$user_id", "website": "$website", "path": "$path", "form_id": "$form_id"},
+            "docs": {"$push": {"_id": "$_id", "id": "$id", "data": "$data"}},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    async for group in db.submissions.aggregate(pipeline):
+        docs = group["docs"]
+        keep = docs[0]
+        for dup in docs[1:]:
+            if dup.get("data"):
+                for key, value in dup["data"].items():
+                    vals = value if isinstance(value, list) else [str(value)]
+                    await db.submissions.update_one(
+                        {"_id": keep["_id"]},
+                        {"$addToSet": {f"data.{key}": {"$each": vals}}}
+                    )
+            await db.submissions.delete_one({"_id": dup["_id"]})
+            if dup.get("id"):
+                await sync_service.record_deletion(db, group["_id"]["user_id"], dup["id"])
+        # the survivor changed too, so synced clients need to pick it up again
+        async with sync_service.versioned_write(db, group["_id"]["user_id"]) as version:
+            await db.submissions.update_one(
+                {"_id": keep["_id"]},
+                {"$max": {"version": version}}
+            )
+        logger.info(f"Merged {len(docs) - 1} duplicate(s) for {group['_id']}")
+
+    # now safe to create the unique index
+    await db.submissions.create_index(
+        [("user_id", 1), ("website", 1), ("path", 1), ("form_id", 1)],
+        unique=True,
+        name="unique_form_submission",
+    )
+
+    # delta sync reads changes and deletions by (user_id, version)
+    await db.submissions.create_index([("user_id", 1), ("version", 1)], name="submission_sync")
+    await db.submission_tombstones.create_index([("user_id", 1), ("version", 1)], name="tombstone_sync")
+
+    # per_key autofill reads a user's most recent submissions
+    await db.submissions.create_index([("user_id", 1), ("timestamp", -1)], name="submission_recent")
+
+    # detail lookups; also covers the etag-only read for conditional GETs
+    await db.submissions.create_index(
+        [("id", 1), ("user_id", 1), ("version", 1), ("timestamp", 1)],
+        name="submission_etag",
+    )
+
+
+async def run_startup_maintenance(db) -> bool:
+    """run the migrations once per version across all workers and pods."""
+    async def task():
+        await migrate_submissions(db)
+
+    return await run_once(
+        db,
+        "startup_maintenance",
+        STARTUP_MAINTENANCE_VERSION,
+        task,
+        ttl_seconds=settings.STARTUP_LEASE_TTL_SECONDS,
+        wait_timeout=settings.STARTUP_WAIT_TIMEOUT_SECONDS,
+    )
+
+
+async def run_key_vector_backfill(db) -> bool:
+    """fill the per_key collection from existing submissions, once per key collection."""
+    async def task():
+        await vector_service.backfill_key_vectors(db)
+
+    try:
+        return await run_once(
+            db,
+            "key_vector_backfill",
+            vector_service.KEYS_COLLECTION_NAME,
+            task,
+            ttl_seconds=settings.STARTUP_LEASE_TTL_SECONDS,
+            # other workers don't need to wait on this, ingest keeps the collection current
+            wait_timeout=0,
+        )
+    except Exception as e:
+        # not marked done, so the next startup retries
+        logger.warning(f"Key vector backfill failed: {e}")
+        return False
@@ -0,0 +1,200 @@
+"""
+On-demand per-request profiling.
+
+A request is profiled when it carries a valid admin token in the X-Profile
+header, or when it is picked by PROFILE_SAMPLE_RATE. For profiled requests we
+record a span timeline (see `span`) and sampled stacks from a background
+thread, and keep the result in a bounded in-memory ring buffer served by the
+admin router. Requests that aren't profiled only pay for one header lookup,
+and `span` returns a shared no-op object.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional
+from uuid import uuid4
+from app.core.config import settings
+from app.core.security import decode_admin_token
+
+PROFILE_HEADER = b"x-profile"
+
+_current: ContextVar[Optional["Profile"]] = ContextVar("current_profile", default=None)
+
+# finished profiles, newest last
+profiles: Deque[dict] = deque(maxlen=settings.PROFILE_BUFFER_SIZE)
+
+
+class Profile:
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans: List[dict] = []
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.status_code: Optional[int] = None
+
+    def to_dict(self, duration: float) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "status_code": self.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "spans": self.spans,
+            "samples": self.samples,
+            # folded stacks ("outer;inner;leaf" -> count), the input format for flamegraph tools
+            "stacks": dict(self.stacks.most_common(settings.PROFILE_MAX_STACKS)),
+        }
+
+
+class _Span:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: Profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.profile.spans.append({
+            "name": self.name,
+            "start_ms": round((self.start - self.profile.started) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str):
+    """`with span("qdrant.search"):` records a timed span on the current request's profile, if any."""
+    profile = _current.get()
+    if profile is None:
+        return _NOOP_SPAN
+    return _Span(profile, name)
+
+
+class _StackSampler:
+    """
+    One daemon thread shared by all in-flight profiles, running only while at
+    least one exists. The event loop is shared, so samples of a profile can
+    include frames from other requests running concurrently on this worker.
+    """
+
+    def __init__(self):
+        self._active: Dict[str, Profile] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: Profile):
+        with self._lock:
+            self._active[profile.id] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: Profile):
+        with self._lock:
+            self._active.pop(profile.id, None)
+
+    def _run(self):
+        interval = settings.PROFILE_SAMPLE_INTERVAL_MS / 1000
+        me = threading.get_ident()
+        names = {}
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active.values())
+
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stacks.append(_fold(names.get(thread_id, str(thread_id)), frame))
+
+            for profile in active:
+                profile.samples += 1
+                profile.stacks.update(stacks)
+
+
+def _fold(thread_name: str, frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    parts.append(thread_name)
+    return ";".join(reversed(parts))
+
+
+_sampler = _StackSampler()
+
+
+def _is_triggered(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return "header" if decode_admin_token(value.decode("latin-1")) else None
+    if settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        trigger = _is_triggered(scope)
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        profile = Profile(scope["method"], scope["path"], trigger)
+        token = _current.set(profile)
+        _sampler.add(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _sampler.remove(profile)
+            _current.reset(token)
+            profiles.append(profile.to_dict(time.perf_counter() - profile.started))
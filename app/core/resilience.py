@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    """time budget shared by every call made on behalf of one request."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """
+    closed -> open when the failure rate over the last window_seconds reaches
+    failure_rate (with at least min_calls recorded); open -> half-open after
+    open_seconds, where a few trial calls decide whether to close again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window_seconds: float = 30,
+        open_seconds: float = 15,
+        half_open_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._window: deque = deque()  # (timestamp, ok)
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._trials < self.half_open_calls:
+            self._trials += 1
+            return True
+        return False
+
+    def release(self):
+        """give back a half-open trial slot whose call ended without a verdict."""
+        if self._state == self.HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def record_success(self):
+        if self._state == self.HALF_OPEN:
+            logger.info(f"[breaker] {self.name} closed again")
+            self._state = self.CLOSED
+            self._window.clear()
+            return
+        self._record(True)
+
+    def record_failure(self):
+        if self._state == self.HALF_OPEN:
+            self._open()
+            return
+        self._record(False)
+        failures = sum(1 for _, ok in self._window if not ok)
+        if len(self._window) >= self.min_calls and failures / len(self._window) >= self.failure_rate:
+            self._open()
+
+    def _record(self, ok: bool):
+        now = time.monotonic()
+        self._window.append((now, ok))
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+
+    def _open(self):
+        logger.warning(f"[breaker] {self.name} opened for {self.open_seconds}s")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._window.clear()
+
+    async def call(
+        self,
+        fn: Callable[..., Awaitable[T]],
+        *args,
+        timeout: float,
+        deadline: Optional[Deadline] = None,
+        **kwargs,
+    ) -> T:
+        """
+        run fn under the breaker with a timeout capped by the deadline's remaining budget.
+        Only failures within the full timeout count against the dependency: running
+        out of request budget raises DeadlineExceeded, and like a cancellation it
+        records nothing and hands back a half-open trial slot.
+        """
+        capped = False
+        if deadline is not None:
+            if deadline.expired:
+                raise DeadlineExceeded(f"{self.name}: request deadline of {deadline.seconds}s exceeded")
+            remaining = deadline.remaining()
+            if remaining < timeout:
+                timeout, capped = remaining, True
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name}: circuit open")
+
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), timeout=timeout)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except asyncio.TimeoutError:
+            if capped:
+                self.release()
+                raise DeadlineExceeded(f"{self.name}: request deadline of {deadline.seconds}s exceeded")
+            self.record_failure()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
@@ -0,0 +1,72 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+from app.core.config import settings
+
+# optional encoders from the `fast` extra (uv sync --extra fast); orjson is required
+# once FAST_RESPONSES is on, msgpack only for Accept: application/msgpack
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def check_encoders():
+    """called at startup: FAST_RESPONSES without orjson would quietly be slower than the default path."""
+    if not settings.FAST_RESPONSES:
+        return
+    if orjson is None:
+        raise RuntimeError("FAST_RESPONSES is enabled but orjson is not installed (uv sync --extra fast)")
+    if settings.MSGPACK_RESPONSES and msgpack is None:
+        logger.warning("MSGPACK_RESPONSES is enabled but msgpack is not installed (uv sync --extra fast); answering with JSON")
+
+
+def _default(obj: Any):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def encode_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode_msgpack(content: Any) -> bytes:
+    return msgpack.packb(content, default=_default)
+
+
+def wants_msgpack(request: Request) -> bool:
+    if msgpack is None or not settings.MSGPACK_RESPONSES:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def response_media_type(request: Request) -> str:
+    """what fast_response will encode for this request; part of any cache key or etag."""
+    return MSGPACK_MEDIA_TYPES[0] if wants_msgpack(request) else "application/json"
+
+
+def fast_response(request: Request, content: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Encode an already-trusted payload directly, skipping response_model validation.
+    Callers must shape `content` exactly like the declared response model.
+    """
+    # the body depends on Accept, so shared caches must not hand msgpack to json clients
+    headers = {**(headers or {}), "Vary": "Accept"}
+    media_type = response_media_type(request)
+    body = encode_msgpack(content) if media_type in MSGPACK_MEDIA_TYPES else encode_json(content)
+    return Response(body, status_code=status_code, headers=headers, media_type=media_type)
@@ -40,3 +40,21 @@ def decode_refresh_token(token: str) -> dict:
         return payload
     except jwt.JWTError:
         return None
+
+def create_admin_token(expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Token for operator-only endpoints and the X-Profile header.
+    Mint one with: uv run python -c "from app.core.security import create_admin_token; print(create_admin_token())"
+    """
+    expire = datetime.utcnow() + (expires_delta or timedelta(hours=settings.ADMIN_TOKEN_EXPIRE_HOURS))
+    to_encode = {"sub": "admin", "scope": "admin", "exp": expire}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def decode_admin_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("scope") != "admin":
+            return None
+        return payload
+    except jwt.JWTError:
+        return None
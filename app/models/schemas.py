@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -31,7 +31,7 @@ class AutofillRequest(BaseModel):
     website: Optional[str] = Field(None, description="Filter suggestions by website")
     path: Optional[str] = Field(None, description="Filter suggestions by path")
     form_id: Optional[str] = Field(None, description="Filter suggestions by form id")
-    threshold: float = Field(0.8, ge=0.0, le=1.0, description="Minimum similarity score")
+    threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="Minimum similarity score, defaults to the embedding model's threshold")
     multiple: bool = Field(False, description="Return multiple suggestions if true")
     limit: int = Field(3, ge=1, description="Max websites to return and max suggestions per key if multiple is true")
 
@@ -42,5 +42,29 @@ class WebsiteSuggestion(BaseModel):
 class AutofillResponse(BaseModel):
     suggestions: List[WebsiteSuggestion]
 
+class SyncEntry(BaseModel):
+    id: str
+    website: str
+    path: str
+    form_id: Optional[str] = None
+    latest: Dict[str, Optional[str]]
+    version: int
+    timestamp: Optional[datetime] = None
+
+class QuantizedEmbeddings(BaseModel):
+    encoding: Literal["int8", "binary", "float32"]
+    shape: List[int] = Field(..., description="[number of keys, dimension]")
+    data: str = Field(..., description="base64 of the packed row-major matrix, rows in `keys` order")
+    scale: Optional[float] = Field(None, description="multiply int8 values by this to get floats")
+
+class SyncResponse(BaseModel):
+    cursor: int = Field(..., description="pass back as `cursor` on the next sync")
+    full: bool = Field(..., description="true if this is a full snapshot and local state should be replaced")
+    model: str
+    submissions: List[SyncEntry]
+    deleted: List[str] = []
+    keys: List[str] = []
+    embeddings: Optional[QuantizedEmbeddings] = None
+
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
@@ -0,0 +1,163 @@
+import base64
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import numpy as np
+from pymongo import ReturnDocument
+from app.services import vector_service
+
+logger = logging.getLogger(__name__)
+
+# in-flight entries older than this belong to a crashed writer and no longer hold cursors back
+INFLIGHT_TIMEOUT_SECONDS = 60
+
+
+@asynccontextmanager
+async def versioned_write(db, user_id: str) -> AsyncIterator[int]:
+    """
+    Per-user change counter. Every write to a user's submissions takes the next
+    value as the document's `version`, so a client cursor is just the highest
+    version it has seen. Versions are taken before the write lands, so two
+    writers can commit out of order: the version stays listed as in flight on
+    the counter until the block exits, and `sync_point` keeps cursors below it.
+    Write it with `$max` so a slower writer can't lower a document's version.
+    """
+    now = datetime.utcnow()
+    since = now - timedelta(seconds=INFLIGHT_TIMEOUT_SECONDS)
+    # one atomic step: bump seq, append {v: seq, at} and drop entries of crashed writers.
+    # The new entry is built with $map rather than an array literal because
+    # mongomock-motor (tests) doesn't evaluate expressions inside literals.
+    counter = await db.sync_counters.find_one_and_update(
+        {"_id": user_id},
+        [
+            {"$set": {"seq": {"$add": [{"$ifNull": ["$seq", 0]}, 1]}}},
+            {"$set": {"inflight": {"$concatArrays": [
+                {"$filter": {"input": {"$ifNull": ["$inflight", []]}, "cond": {"$gt": ["$$this.at", since]}}},
+                {"$map": {"input": [0], "in": {"v": "$seq", "at": now}}},
+            ]}}},
+        ],
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    version = counter["seq"]
+    try:
+        yield version
+    finally:
+        await db.sync_counters.update_one({"_id": user_id}, {"$pull": {"inflight": {"v": version}}})
+
+
+async def sync_point(db, user_id: str) -> Tuple[int, int]:
+    """
+    (head, stable) from one read of the counter: every version up to stable has
+    landed, so a cursor there can't skip a write that is still in flight.
+    """
+    counter = await db.sync_counters.find_one({"_id": user_id}) or {}
+    head = counter.get("seq", 0)
+    since = datetime.utcnow() - timedelta(seconds=INFLIGHT_TIMEOUT_SECONDS)
+    pending = [entry["v"] - 1 for entry in counter.get("inflight", []) if entry["at"] > since]
+    return head, min([head, *pending])
+
+
+async def record_deletion(db, user_id: str, submission_id: str):
+    """leave a tombstone so clients holding the submission drop it on their next sync."""
+    async with versioned_write(db, user_id) as version:
+        await db.submission_tombstones.insert_one({
+            "id": submission_id,
+            "user_id": user_id,
+            "version": version,
+            "deleted_at": datetime.utcnow(),
+        })
+
+
+def quantize(vectors: List[List[float]], mode: str) -> Dict[str, Any]:
+    """
+    Pack a (keys x dimension) matrix into a base64 blob.
+    - int8: round(v * 127), cosine ~= dot / 127^2 since vectors are unit length
+    - binary: sign bits packed 8 per byte, compare with hamming distance
+    - float32: raw little-endian floats
+    """
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), vector_service.ACTIVE_MODEL.dimension)
+    if mode == "int8":
+        packed = np.clip(np.round(matrix * 127), -127, 127).astype(np.int8)
+        extra = {"scale": 1 / 127}
+    elif mode == "binary":
+        packed = np.packbits(matrix > 0, axis=1)
+        extra = {}
+    else:
+        packed = matrix.astype("<f4")
+        extra = {}
+    return {
+        "encoding": mode,
+        "shape": [matrix.shape[0], matrix.shape[1]],
+        "data": base64.b64encode(packed.tobytes()).decode(),
+        **extra,
+    }
+
+
+def _entry(doc: dict) -> dict:
+    data = doc.get("data", {})
+    return {
+        "id": doc["id"],
+        "website": doc["website"],
+        "path": doc.get("path", "/"),
+        "form_id": doc.get("form_id"),
+        "latest": {k: v[-1] if isinstance(v, list) and v else v for k, v in data.items()},
+        "version": doc.get("version", 0),
+        "timestamp": doc.get("timestamp"),
+    }
+
+
+async def build_sync(
+    db,
+    user_id: str,
+    cursor: Optional[int] = None,
+    embeddings: bool = True,
+    quantization: str = "int8",
+) -> dict:
+    """
+    Full snapshot when there is no usable cursor, otherwise only the submissions
+    written and the ids deleted since it. Embeddings cover the keys of the
+    returned submissions only; clients keep the ones they already have.
+    """
+    head, stable = await sync_point(db, user_id)
+    full = not cursor or cursor > head
+
+    query: Dict[str, Any] = {"user_id": user_id}
+    if not full:
+        query["version"] = {"$gt": cursor}
+
+    docs = await db.submissions.find(query, {"_id": 0}).to_list(length=None)
+    entries = [_entry(doc) for doc in docs]
+
+    deleted: List[str] = []
+    if not full:
+        tombstones = db.submission_tombstones.find(
+            {"user_id": user_id, "version": {"$gt": cursor}}, {"_id": 0, "id": 1}
+        )
+        deleted = [t["id"] async for t in tombstones]
+
+    # versions up to `stable` are all committed, so nothing below the returned cursor
+    # can still show up; whatever above it we already sent comes again next time,
+    # which clients apply idempotently
+    response: Dict[str, Any] = {
+        "cursor": stable,
+        "full": full,
+        "model": vector_service.ACTIVE_MODEL.name,
+        "submissions": entries,
+        "deleted": deleted,
+        "keys": [],
+        "embeddings": None,
+    }
+
+    if embeddings and entries:
+        keys = sorted({k for e in entries for k in e["latest"]})
+        try:
+            vectors = await vector_service.embed_keys(keys)
+            response["keys"] = keys
+            response["embeddings"] = quantize(vectors, quantization)
+        except Exception as e:
+            # values are still useful for exact-name matching without the vectors
+            logger.warning(f"[sync] embedding failed, sending values only: {e}")
+
+    return response
@@ -1,14 +1,211 @@
+import asyncio
 import hashlib
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
+import numpy as np
 from qdrant_client.http import models
-from app.core.database import qdrant_client
+from app.core.config import settings
+from app.core.database import get_db, get_qdrant
+from app.core.profiling import span
+from app.core.resilience import CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded
 from app.models.schemas import SubmissionCreate, AutofillRequest
 
 logger = logging.getLogger(__name__)
 
-COLLECTION_NAME = "user_form_data"
-EMBEDDING_MODEL = "BAAI/bge-small-en"
+
+@dataclass(frozen=True)
+class EmbeddingModelSpec:
+    name: str                  # registry key, used in settings and collection names
+    model: str                 # fastembed model name
+    dimension: int             # stored dimension (may truncate a matryoshka model)
+    distance: models.Distance
+    default_threshold: float   # autofill threshold when the request doesn't set one
+    native_dimension: Optional[int] = None
+    query_prefix: str = ""
+    document_prefix: str = ""
+
+    @property
+    def truncated(self) -> bool:
+        return self.native_dimension is not None and self.dimension < self.native_dimension
+
+
+EMBEDDING_MODELS: Dict[str, EmbeddingModelSpec] = {
+    spec.name: spec
+    for spec in (
+        EmbeddingModelSpec("bge-small-en", "BAAI/bge-small-en", 384, models.Distance.COSINE, 0.8),
+        EmbeddingModelSpec("bge-small-en-v1.5", "BAAI/bge-small-en-v1.5", 384, models.Distance.COSINE, 0.75),
+        EmbeddingModelSpec("bge-small-en-v1.5-q", "Qdrant/bge-small-en-v1.5-onnx-Q", 384, models.Distance.COSINE, 0.75),
+        EmbeddingModelSpec("all-minilm-l6-v2", "sentence-transformers/all-MiniLM-L6-v2", 384, models.Distance.COSINE, 0.6),
+        EmbeddingModelSpec("jina-v2-small-en", "jinaai/jina-embeddings-v2-small-en", 512, models.Distance.COSINE, 0.75),
+        EmbeddingModelSpec(
+            "nomic-v1.5-256", "nomic-ai/nomic-embed-text-v1.5", 256, models.Distance.COSINE, 0.7,
+            native_dimension=768, query_prefix="search_query: ", document_prefix="search_document: ",
+        ),
+    )
+}
+
+DEFAULT_EMBEDDING_MODEL = "bge-small-en"
+BASE_COLLECTION_NAME = "user_form_data"
+
+
+def get_model_spec(name: str) -> EmbeddingModelSpec:
+    try:
+        return EMBEDDING_MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown embedding model '{name}', expected one of {sorted(EMBEDDING_MODELS)}")
+
+
+def collection_name_for(spec: EmbeddingModelSpec) -> str:
+    """each model gets its own collection so switching models never mixes vector spaces."""
+    if spec.name == DEFAULT_EMBEDDING_MODEL:
+        return BASE_COLLECTION_NAME
+    return f"{BASE_COLLECTION_NAME}__{spec.name.replace('.', '_')}"
+
+
+ACTIVE_MODEL = get_model_spec(settings.EMBEDDING_MODEL)
+COLLECTION_NAME = collection_name_for(ACTIVE_MODEL)
+EMBEDDING_MODEL = ACTIVE_MODEL.model
+
+# per_field: one point per (user, website, path, form_id, key) carrying the value
+# per_key: one point per (user, normalized key); values are looked up in mongo
+PER_FIELD = "per_field"
+PER_KEY = "per_key"
+STORAGE_MODE = settings.VECTOR_STORAGE
+KEYS_COLLECTION_NAME = f"{COLLECTION_NAME}__keys"
+ACTIVE_COLLECTION = KEYS_COLLECTION_NAME if STORAGE_MODE == PER_KEY else COLLECTION_NAME
+
+
+class Embedder:
+    """lazily loaded fastembed model for one registry entry."""
+
+    def __init__(self, spec: EmbeddingModelSpec):
+        self.spec = spec
+        self.load_seconds: Optional[float] = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    from fastembed import TextEmbedding
+                    self._model = TextEmbedding(model_name=self.spec.model)
+                    self.load_seconds = time.perf_counter() - started
+                    logger.info(f"[vector] loaded {self.spec.model} in {self.load_seconds:.2f}s")
+        return self._model
+
+    def _finish(self, vectors) -> List[List[float]]:
+        if not self.spec.truncated:
+            return [vec.tolist() for vec in vectors]
+        out = []
+        for vec in vectors:
+            # matryoshka truncation: keep the leading dims and renormalize for cosine
+            vec = vec[:self.spec.dimension]
+            out.append((vec / (np.linalg.norm(vec) or 1.0)).tolist())
+        return out
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.spec.document_prefix:
+            texts = [self.spec.document_prefix + t for t in texts]
+        return self._finish(self.load().passage_embed(texts))
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        if self.spec.query_prefix:
+            texts = [self.spec.query_prefix + t for t in texts]
+        return self._finish(self.load().query_embed(texts))
+
+
+# one model per worker (see warm_up)
+_embedder = Embedder(ACTIVE_MODEL)
+
+
+def embedder_loaded() -> bool:
+    return _embedder.loaded
+
+
+def embedder_load_seconds() -> Optional[float]:
+    return _embedder.load_seconds
+
+
+async def embed_documents(texts: List[str]) -> List[List[float]]:
+    """embed stored field names; runs off the event loop since onnx inference is cpu-bound."""
+    return await asyncio.to_thread(_embedder.embed_documents, texts)
+
+
+async def embed_queries(texts: List[str]) -> List[List[float]]:
+    return await asyncio.to_thread(_embedder.embed_queries, texts)
+
+
+# key text -> document vector; field names repeat a lot across users and forms
+_key_vector_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+
+
+async def embed_keys(keys: List[str]) -> List[List[float]]:
+    """embed_documents with an in-process lru in front of it."""
+    # resolve from a local copy: concurrent calls can evict entries while we await the model
+    found: Dict[str, List[float]] = {}
+    for key in dict.fromkeys(keys):
+        if key in _key_vector_cache:
+            _key_vector_cache.move_to_end(key)
+            found[key] = _key_vector_cache[key]
+    missing = [k for k in dict.fromkeys(keys) if k not in found]
+    if missing:
+        for key, vector in zip(missing, await embed_documents(missing)):
+            found[key] = vector
+            _key_vector_cache[key] = vector
+            _key_vector_cache.move_to_end(key)
+    while len(_key_vector_cache) > settings.KEY_VECTOR_CACHE_SIZE:
+        _key_vector_cache.popitem(last=False)
+    return [found[key] for key in keys]
+
+
+async def warm_up():
+    """load the model and run one inference so the first request doesn't pay for it."""
+    await embed_queries(["email"])
+
+
+# every qdrant call goes through this breaker so a slow or dead qdrant fails fast
+qdrant_breaker = CircuitBreaker(
+    "qdrant",
+    failure_rate=settings.QDRANT_BREAKER_FAILURE_RATE,
+    min_calls=settings.QDRANT_BREAKER_MIN_CALLS,
+    window_seconds=settings.QDRANT_BREAKER_WINDOW_SECONDS,
+    open_seconds=settings.QDRANT_BREAKER_OPEN_SECONDS,
+)
+
+# last known hits per (user, filter, key); served when qdrant can't answer in time
+_hit_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# set once the collection is known to exist with the right config
+_collection_ready = False
+
+
+def _cache_hits(cache_key: tuple, hits: List[tuple]):
+    _hit_cache[cache_key] = (time.monotonic(), hits)
+    _hit_cache.move_to_end(cache_key)
+    while len(_hit_cache) > settings.AUTOFILL_CACHE_SIZE:
+        _hit_cache.popitem(last=False)
+
+
+def _cached_hits(cache_key: tuple) -> Optional[List[tuple]]:
+    entry = _hit_cache.get(cache_key)
+    if entry is None:
+        return None
+    stored_at, hits = entry
+    if time.monotonic() - stored_at > settings.AUTOFILL_CACHE_TTL_SECONDS:
+        del _hit_cache[cache_key]
+        return None
+    return hits
 
 
 def _point_id(user_id: str, website: str, path: str, form_id: str | None, key: str) -> str:
@@ -17,36 +214,131 @@ def _point_id(user_id: str, website: str, path: str, form_id: str | None, key: s
     return hashlib.md5(raw.encode()).hexdigest()
 
 
+def normalize_key(key: str) -> str:
+    """'First_Name', 'first-name' and ' first name ' all share one key vector."""
+    return " ".join(re.split(r"[^0-9a-z]+", key.lower())).strip() or key.strip().lower()
+
+
+def _key_point_id(user_id: str, normalized_key: str) -> str:
+    return hashlib.md5(f"{user_id}:{normalized_key}".encode()).hexdigest()
+
+
 async def ensure_collection():
-    if await qdrant_client.collection_exists(COLLECTION_NAME):
+    qdrant_client = get_qdrant()
+    if await qdrant_client.collection_exists(ACTIVE_COLLECTION):
         # check if collection has the correct (unnamed) vector config
-        info = await qdrant_client.get_collection(COLLECTION_NAME)
-        if isinstance(info.config.params.vectors, dict):
-            # old collection uses named vectors, recreate with unnamed
+        info = await qdrant_client.get_collection(ACTIVE_COLLECTION)
+        vectors = info.config.params.vectors
+        if isinstance(vectors, dict) or vectors.size != ACTIVE_MODEL.dimension:
+            # old collection uses named vectors or another dimension, recreate
             logger.info("Recreating qdrant collection with correct vector config")
-            await qdrant_client.delete_collection(COLLECTION_NAME)
+            await qdrant_client.delete_collection(ACTIVE_COLLECTION)
 
-    if not await qdrant_client.collection_exists(COLLECTION_NAME):
+    if not await qdrant_client.collection_exists(ACTIVE_COLLECTION):
         await qdrant_client.create_collection(
-            collection_name=COLLECTION_NAME,
+            collection_name=ACTIVE_COLLECTION,
             vectors_config=models.VectorParams(
-                size=384,
-                distance=models.Distance.COSINE,
+                size=ACTIVE_MODEL.dimension,
+                distance=ACTIVE_MODEL.distance,
             ),
         )
 
     # ensure indexes exist for filtering
-    for field in ("user_id", "website", "path", "form_id"):
+    fields = ("user_id",) if STORAGE_MODE == PER_KEY else ("user_id", "website", "path", "form_id")
+    for field in fields:
         await qdrant_client.create_payload_index(
-            collection_name=COLLECTION_NAME,
+            collection_name=ACTIVE_COLLECTION,
             field_name=field,
             field_schema="keyword",
         )
 
 
+async def _ensure_collection_once():
+    global _collection_ready
+    if not _collection_ready:
+        await qdrant_breaker.call(ensure_collection, timeout=settings.QDRANT_SETUP_TIMEOUT_SECONDS)
+        _collection_ready = True
+
+
+async def ingest_keys(user_id: str, keys: List[str]):
+    """
+    per_key storage: embed each normalized key once per user. Keys we already
+    have only get their spelling variant added to the payload, no re-embedding.
+    """
+    await _ensure_collection_once()
+
+    variants: Dict[str, set] = {}
+    for key in keys:
+        variants.setdefault(normalize_key(key), set()).add(key)
+    ids = {norm: _key_point_id(user_id, norm) for norm in variants}
+
+    existing = await qdrant_breaker.call(
+        get_qdrant().retrieve,
+        collection_name=KEYS_COLLECTION_NAME,
+        ids=list(ids.values()),
+        with_payload=["keys"],
+        timeout=settings.QDRANT_TIMEOUT_SECONDS,
+    )
+    known = {str(p.id).replace("-", ""): set(p.payload.get("keys", [])) for p in existing}
+
+    new_keys = [norm for norm in variants if ids[norm] not in known]
+    if new_keys:
+        vectors = await embed_keys(new_keys)
+        await qdrant_breaker.call(
+            get_qdrant().upsert,
+            collection_name=KEYS_COLLECTION_NAME,
+            points=[
+                models.PointStruct(
+                    id=ids[norm],
+                    vector=vector,
+                    payload={"user_id": user_id, "normalized_key": norm, "keys": sorted(variants[norm]), "type": "key"},
+                )
+                for norm, vector in zip(new_keys, vectors)
+            ],
+            timeout=settings.QDRANT_TIMEOUT_SECONDS,
+        )
+
+    for norm, originals in variants.items():
+        seen = known.get(ids[norm])
+        if seen is not None and not originals <= seen:
+            await qdrant_breaker.call(
+                get_qdrant().set_payload,
+                collection_name=KEYS_COLLECTION_NAME,
+                payload={"keys": sorted(seen | originals)},
+                points=[ids[norm]],
+                timeout=settings.QDRANT_TIMEOUT_SECONDS,
+            )
+
+
+async def backfill_key_vectors(db):
+    """populate the per_key collection from existing submissions, one user at a time."""
+    pipeline = [
+        {"$project": {"user_id": 1, "keys": {"$objectToArray": {"$ifNull": ["$data", {}]}}}},
+        {"$unwind": "$keys"},
+        {"$group": {"_id": "$user_id", "keys": {"$addToSet": "$keys.k"}}},
+    ]
+    users = 0
+    async for group in db.submissions.aggregate(pipeline):
+        await ingest_keys(group["_id"], group["keys"])
+        users += 1
+    logger.info(f"[vector] backfilled key vectors for {users} user(s)")
+
+
 async def ingest_submission(user_id: str, submission: SubmissionCreate):
+    with span("vector.ingest_submission"):
+        await _ingest_submission(user_id, submission)
+
+
+async def _ingest_submission(user_id: str, submission: SubmissionCreate):
+    global _collection_ready
     try:
-        await ensure_collection()
+        if STORAGE_MODE == PER_KEY:
+            keys = [k for k, v in submission.data.items() if isinstance(v, (str, int, float, bool))]
+            if keys:
+                await ingest_keys(user_id, keys)
+            return
+
+        await _ensure_collection_once()
 
         documents = []
         metadata = []
@@ -69,29 +361,125 @@ async def ingest_submission(user_id: str, submission: SubmissionCreate):
             ids.append(_point_id(user_id, submission.website, submission.path, submission.form_id, key))
 
         if documents:
+            vectors = await embed_documents(documents)
             points = [
                 models.PointStruct(
                     id=pid,
-                    vector=models.Document(text=doc, model=EMBEDDING_MODEL),
+                    vector=vector,
                     payload=meta,
                 )
-                for pid, doc, meta in zip(ids, documents, metadata)
+                for pid, vector, meta in zip(ids, vectors, metadata)
             ]
-            await qdrant_client.upsert(
+            await qdrant_breaker.call(
+                get_qdrant().upsert,
                 collection_name=COLLECTION_NAME,
                 points=points,
+                timeout=settings.QDRANT_TIMEOUT_SECONDS,
             )
     except Exception as e:
+        # re-check the collection next time in case it was dropped underneath us
+        _collection_ready = False
         logger.warning(f"[vector] ingestion failed (qdrant may be unreachable): {e}")
 
 
-async def search_autofill(user_id: str, request: AutofillRequest) -> List[Dict[str, Any]]:
+async def _search_key(key: str, query_vector: List[float], query_filter, limit: int, cache_key: tuple, deadline: Deadline) -> List[tuple]:
+    """
+    hits for one key, falling back to the last cached hits on failure:
+    (score, website, value) for per_field storage, (score, original keys) for per_key.
+    """
     try:
-        if not await qdrant_client.collection_exists(COLLECTION_NAME):
-            return []
+        with span(f"vector.qdrant_search[{key}]"):
+            search_result = await qdrant_breaker.call(
+                get_qdrant().query_points,
+                collection_name=ACTIVE_COLLECTION,
+                query=query_vector,
+                query_filter=query_filter,
+                limit=limit,
+                timeout=settings.QDRANT_TIMEOUT_SECONDS,
+                deadline=deadline,
+            )
     except Exception as e:
-        logger.warning(f"[vector] qdrant unreachable, returning empty: {e}")
-        return []
+        cached = _cached_hits(cache_key)
+        # an open breaker or spent deadline hits every key of the request alike; the breaker logs its own transitions
+        level = logging.DEBUG if isinstance(e, (CircuitOpenError, DeadlineExceeded)) else logging.WARNING
+        logger.log(level, f"[vector] search failed for key '{key}' ({'using cache' if cached is not None else 'skipped'}): {e!r}")
+        return cached or []
+
+    if STORAGE_MODE == PER_KEY:
+        hits = [(h.score, tuple(h.payload.get("keys", []))) for h in search_result.points]
+    else:
+        hits = [(h.score, h.payload.get("website", "unknown"), h.payload["value"]) for h in search_result.points]
+    _cache_hits(cache_key, hits)
+    return hits
+
+
+async def _expand_key_hits(
+    user_id: str,
+    request: AutofillRequest,
+    results: List[List[tuple]],
+    threshold: float,
+    deadline: Deadline,
+) -> List[List[tuple]]:
+    """
+    per_key storage: turn (score, original keys) hits into (score, website, value)
+    by reading the latest value of those keys from the user's most recent matching
+    submissions, within what is left of the request's deadline.
+    """
+    originals = {k for hits in results for score, keys in hits if score >= threshold for k in keys}
+    if not originals:
+        return [[] for _ in results]
+
+    query: Dict[str, Any] = {
+        "user_id": user_id,
+        "$or": [{f"data.{k}": {"$exists": True}} for k in originals],
+    }
+    if request.website:
+        query["website"] = request.website
+    if request.path:
+        query["path"] = request.path
+    if request.form_id:
+        query["form_id"] = request.form_id
+
+    if deadline.expired:
+        raise DeadlineExceeded(f"autofill deadline of {deadline.seconds}s exceeded before expanding key hits")
+    projection = {"_id": 0, "website": 1, **{f"data.{k}": 1 for k in originals}}
+    # only request.limit websites are returned, so the most recent forms are plenty
+    cursor = get_db().submissions.find(
+        query, projection, max_time_ms=max(1, int(deadline.remaining() * 1000)),
+    ).sort("timestamp", -1).limit(settings.KEY_EXPAND_LIMIT)
+    docs = await cursor.to_list(length=None)
+
+    expanded = []
+    for hits in results:
+        key_hits = []
+        for score, keys in hits:
+            if score < threshold:
+                continue
+            for doc in docs:
+                data = doc.get("data", {})
+                for k in keys:
+                    values = data.get(k)
+                    if values:
+                        key_hits.append((score, doc["website"], values[-1] if isinstance(values, list) else values))
+        expanded.append(key_hits)
+    return expanded
+
+
+async def search_autofill(user_id: str, request: AutofillRequest) -> List[Dict[str, Any]]:
+    global _collection_ready
+    deadline = Deadline(settings.AUTOFILL_DEADLINE_SECONDS)
+
+    if not _collection_ready:
+        try:
+            if not await qdrant_breaker.call(
+                get_qdrant().collection_exists, ACTIVE_COLLECTION,
+                timeout=settings.QDRANT_TIMEOUT_SECONDS, deadline=deadline,
+            ):
+                return []
+            _collection_ready = True
+        except Exception as e:
+            # fall through: per-key searches can still be served from the cache
+            logger.warning(f"[vector] qdrant unreachable: {e!r}")
 
     # build filter conditions
     must_conditions = [
@@ -101,21 +489,22 @@ async def search_autofill(user_id: str, request: AutofillRequest) -> List[Dict[s
         )
     ]
 
-    if request.website:
+    # per_key points aren't tied to a form; those filters are applied in mongo instead
+    if request.website and STORAGE_MODE == PER_FIELD:
         must_conditions.append(
             models.FieldCondition(
                 key="website",
                 match=models.MatchValue(value=request.website)
             )
         )
-    if request.path:
+    if request.path and STORAGE_MODE == PER_FIELD:
         must_conditions.append(
             models.FieldCondition(
                 key="path",
                 match=models.MatchValue(value=request.path)
             )
         )
-    if request.form_id:
+    if request.form_id and STORAGE_MODE == PER_FIELD:
         must_conditions.append(
             models.FieldCondition(
                 key="form_id",
@@ -124,61 +513,80 @@ async def search_autofill(user_id: str, request: AutofillRequest) -> List[Dict[s
         )
 
     query_filter = models.Filter(must=must_conditions)
+    threshold = request.threshold if request.threshold is not None else ACTIVE_MODEL.default_threshold
 
     # collect all hits across keys, grouped by website
     # structure: { website: { key: [ (score, value), ... ] } }
     website_hits: Dict[str, Dict[str, list]] = {}
 
-    for key in request.keys:
-        try:
-            search_result = await qdrant_client.query_points(
-                collection_name=COLLECTION_NAME,
-                query=models.Document(text=key, model=EMBEDDING_MODEL),
-                query_filter=query_filter,
-                limit=request.limit * 5,  # fetch extra to cover multiple websites
+    try:
+        with span("vector.embed_queries"):
+            query_vectors = await embed_queries(request.keys) if request.keys else []
+    except Exception as e:
+        logger.warning(f"[vector] embedding failed, returning empty: {e}")
+        return []
+
+    # search all keys concurrently within the shared deadline; keys that miss it
+    # come back from the cache or empty, so the response is partial but bounded in time
+    filter_key = (user_id, request.website, request.path, request.form_id, request.limit)
+    semaphore = asyncio.Semaphore(settings.QDRANT_SEARCH_CONCURRENCY)
+
+    async def search_one(key: str, query_vector: List[float]) -> List[tuple]:
+        async with semaphore:
+            return await _search_key(
+                key, query_vector, query_filter,
+                # per_field: fetch extra to cover multiple websites; per_key: a few distinct keys
+                limit=settings.KEY_SEARCH_LIMIT if STORAGE_MODE == PER_KEY else request.limit * 5,
+                cache_key=(*filter_key, key),
+                deadline=deadline,
             )
 
-            for h in search_result.points:
-                print(f"  '{key}' -> '{h.payload.get('original_key')}' = {h.score:.4f}")
+    results = await asyncio.gather(*(search_one(k, v) for k, v in zip(request.keys, query_vectors)))
 
-            # filter by threshold
-            hits = [h for h in search_result.points if h.score >= request.threshold]
+    if STORAGE_MODE == PER_KEY:
+        try:
+            with span("vector.expand_key_hits"):
+                results = await _expand_key_hits(user_id, request, results, threshold, deadline)
+        except Exception as e:
+            logger.warning(f"[vector] expanding key hits failed, returning empty: {e!r}")
+            return []
 
-            for hit in hits:
-                website = hit.payload.get("website", "unknown")
+    with span("vector.group_results"):
+        for key, key_hits in zip(request.keys, results):
+            # filter by threshold
+            for score, website, value in key_hits:
+                if score < threshold:
+                    continue
                 if website not in website_hits:
                     website_hits[website] = {}
                 if key not in website_hits[website]:
                     website_hits[website][key] = []
-                website_hits[website][key].append((hit.score, hit.payload["value"]))
+                website_hits[website][key].append((score, value))
 
-        except Exception as e:
-            logger.warning(f"[vector] search failed for key '{key}': {e}")
+        # sort websites by number of matched keys (descending), then build response
+        sorted_websites = sorted(website_hits.keys(), key=lambda w: len(website_hits[w]), reverse=True)
 
-    # sort websites by number of matched keys (descending), then build response
-    sorted_websites = sorted(website_hits.keys(), key=lambda w: len(website_hits[w]), reverse=True)
+        # cap number of websites
+        sorted_websites = sorted_websites[:request.limit]
 
-    # cap number of websites
-    sorted_websites = sorted_websites[:request.limit]
-
-    suggestions = []
-    for website in sorted_websites:
-        fields: Dict[str, Any] = {}
-        for key in request.keys:
-            key_hits = website_hits[website].get(key)
-            if not key_hits:
-                fields[key] = [] if request.multiple else None
-                continue
+        suggestions = []
+        for website in sorted_websites:
+            fields: Dict[str, Any] = {}
+            for key in request.keys:
+                key_hits = website_hits[website].get(key)
+                if not key_hits:
+                    fields[key] = [] if request.multiple else None
+                    continue
 
-            # sort by score descending
-            key_hits.sort(key=lambda x: x[0], reverse=True)
+                # sort by score descending
+                key_hits.sort(key=lambda x: x[0], reverse=True)
 
-            if request.multiple:
-                fields[key] = [val for _, val in key_hits]
-            else:
-                fields[key] = key_hits[0][1]
+                if request.multiple:
+                    fields[key] = [val for _, val in key_hits]
+                else:
+                    fields[key] = key_hits[0][1]
 
-        suggestions.append({"website": website, "fields": fields})
+            suggestions.append({"website": website, "fields": fields})
 
     return suggestions
 
@@ -0,0 +1,54 @@
+"""
+Shared helpers for the offline benchmarks.
+Call `use_offline_settings()` before importing anything from `app` so the
+settings object can be built without a real .env.
+"""
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+DATA_DIR = Path(__file__).parent / "data"
+
+OFFLINE_ENV = {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "QDRANT_URL": "http://localhost:6333",
+    "QDRANT_API_KEY": "",
+    "GOOGLE_CLIENT_ID": "benchmark",
+    "GOOGLE_CLIENT_SECRET": "benchmark",
+    "SECRET_KEY": "benchmark-secret",
+    "ALGORITHM": "HS256",
+    "API_BASE_URL": "http://localhost:8001",
+}
+
+
+def use_offline_settings(**overrides: str):
+    for key, value in OFFLINE_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update(overrides)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 and mean of samples given in seconds, reported in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(pick(0.50), 3),
+        "p95_ms": round(pick(0.95), 3),
+        "p99_ms": round(pick(0.99), 3),
+    }
+
+
+def write_results(results: dict, output: str | None):
+    text = json.dumps(results, indent=2, default=str)
+    if output:
+        Path(output).write_text(text + "\n")
+    print(text)
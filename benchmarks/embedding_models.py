@@ -0,0 +1,126 @@
+"""
+Recall-vs-latency benchmark for the embedding model registry.
+
+Runs fully offline against the labeled field-name set in data/field_names.json:
+every stored key is embedded as a document, every query is embedded and scored
+against all of them (same cosine scoring qdrant does), and we report
+
+- recall@k at each threshold (expected key in the top k with score >= threshold)
+- false positive rate on queries that should match nothing
+- document embedding throughput, model load time and per-query latency
+
+Usage:
+    uv run python -m benchmarks.embedding_models
+    uv run python -m benchmarks.embedding_models --models bge-small-en,all-minilm-l6-v2 --output models.json
+"""
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.common import DATA_DIR, percentiles, use_offline_settings, write_results
+
+use_offline_settings()
+
+import numpy as np  # noqa: E402
+from app.services.vector_service import EMBEDDING_MODELS, Embedder, EmbeddingModelSpec  # noqa: E402
+
+DEFAULT_THRESHOLDS = [0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9]
+
+
+def load_dataset(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def evaluate(spec: EmbeddingModelSpec, dataset: dict, ks: List[int], thresholds: List[float], throughput_rounds: int) -> dict:
+    embedder = Embedder(spec)
+    embedder.load()
+
+    stored = dataset["stored_keys"]
+    queries = dataset["queries"]
+
+    # throughput: embed the stored keys a few times to smooth out onnx warm-up
+    embedder.embed_documents(stored)
+    started = time.perf_counter()
+    for _ in range(throughput_rounds):
+        doc_vectors = embedder.embed_documents(stored)
+    doc_seconds = time.perf_counter() - started
+    docs = np.asarray(doc_vectors, dtype=np.float32)
+
+    # per-query latency includes embedding plus scoring, like one autofill key
+    latencies = []
+    rankings = []
+    for q in queries:
+        started = time.perf_counter()
+        vec = np.asarray(embedder.embed_queries([q["query"]])[0], dtype=np.float32)
+        scores = docs @ vec
+        order = np.argsort(-scores)
+        latencies.append(time.perf_counter() - started)
+        rankings.append([(stored[i], float(scores[i])) for i in order[:max(ks)]])
+
+    thresholds = sorted(set(thresholds + [spec.default_threshold]))
+    by_threshold = {}
+    for threshold in thresholds:
+        recall = {}
+        for k in ks:
+            positives = [(q, r) for q, r in zip(queries, rankings) if q["expected"]]
+            hits = sum(
+                1 for q, r in positives
+                if any(key == q["expected"] and score >= threshold for key, score in r[:k])
+            )
+            recall[f"recall@{k}"] = round(hits / len(positives), 4) if positives else None
+
+        negatives = [r for q, r in zip(queries, rankings) if not q["expected"]]
+        false_positives = sum(1 for r in negatives if r and r[0][1] >= threshold)
+        by_threshold[str(threshold)] = {
+            **recall,
+            "false_positive_rate": round(false_positives / len(negatives), 4) if negatives else None,
+        }
+
+    misses = [
+        {"query": q["query"], "expected": q["expected"], "top": r[0][0], "score": round(r[0][1], 4)}
+        for q, r in zip(queries, rankings)
+        if q["expected"] and r[0][0] != q["expected"]
+    ]
+
+    return {
+        "model": spec.model,
+        "dimension": spec.dimension,
+        "default_threshold": spec.default_threshold,
+        "load_seconds": round(embedder.load_seconds or 0.0, 3),
+        "docs_per_second": round(len(stored) * throughput_rounds / doc_seconds, 1),
+        "query_latency": percentiles(latencies),
+        "thresholds": by_threshold,
+        "top1_misses": misses,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", default=",".join(EMBEDDING_MODELS), help="comma-separated registry names")
+    parser.add_argument("--dataset", default=str(DATA_DIR / "field_names.json"))
+    parser.add_argument("--k", default="1,3", help="comma-separated k values for recall@k")
+    parser.add_argument("--thresholds", default=",".join(map(str, DEFAULT_THRESHOLDS)))
+    parser.add_argument("--throughput-rounds", type=int, default=5)
+    parser.add_argument("--output", help="also write the json report to this file")
+    args = parser.parse_args(argv)
+
+    dataset = load_dataset(args.dataset)
+    ks = [int(k) for k in args.k.split(",")]
+    thresholds = [float(t) for t in args.thresholds.split(",")]
+
+    results: Dict[str, dict] = {}
+    for name in args.models.split(","):
+        spec = EMBEDDING_MODELS[name.strip()]
+        try:
+            results[spec.name] = evaluate(spec, dataset, ks, thresholds, args.throughput_rounds)
+        except Exception as e:
+            # e.g. model download failed; keep going with the others
+            results[spec.name] = {"model": spec.model, "error": str(e)}
+
+    write_results({"benchmark": "embedding_models", "dataset": args.dataset, "models": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
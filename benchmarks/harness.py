@@ -0,0 +1,74 @@
+"""
+Runs the FastAPI app in-process against local stand-ins:
+
+- Qdrant in local ":memory:" mode (or a real url if given)
+- a real Mongo if a uri is given, otherwise mongomock-motor (dev group)
+
+Google OAuth is bypassed: users are inserted directly and get minted JWTs.
+"""
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import httpx
+
+from benchmarks.common import use_offline_settings
+
+
+def configure(mongo_uri: Optional[str] = None, qdrant_url: str = ":memory:", db_name: str = "fl0_bench"):
+    """must run before anything from `app` is imported."""
+    use_offline_settings()
+    os.environ["QDRANT_URL"] = qdrant_url
+    os.environ["MONGO_DB_NAME"] = db_name
+    if mongo_uri:
+        os.environ["MONGO_URI"] = mongo_uri
+
+
+def _local_mongo_client(mongo_uri: Optional[str]):
+    if mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(mongo_uri)
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("No --mongo-uri given and mongomock-motor is not installed (uv sync --group dev)")
+    return AsyncMongoMockClient()
+
+
+async def require_ready(client: httpx.AsyncClient):
+    """abort the run if the app can't actually serve autofill, instead of timing fast failures."""
+    response = await client.get("/ready")
+    if response.status_code != 200:
+        raise SystemExit(f"App is not ready ({response.status_code}): {response.text}")
+
+
+@asynccontextmanager
+async def local_app(mongo_uri: Optional[str] = None, fresh: bool = True):
+    """yields an httpx client wired to the app once /ready passes; runs the real lifespan around it."""
+    from app.core.database import get_db, use_clients
+
+    use_clients(mongo_client=_local_mongo_client(mongo_uri))
+    if fresh:
+        await get_db().client.drop_database(get_db().name)
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            await require_ready(client)
+            yield client
+
+
+async def mint_user(user_id: str) -> Dict[str, str]:
+    """create the user document and return auth headers for it."""
+    from datetime import datetime
+    from app.core.database import get_db
+    from app.core.security import create_access_token
+
+    await get_db().users.update_one(
+        {"user_id": user_id},
+        {"$set": {"user_id": user_id, "email": f"{user_id}@bench.local", "name": user_id, "updated_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
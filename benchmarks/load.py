@@ -0,0 +1,155 @@
+"""
+Self-contained load benchmark for the HTTP API.
+
+Drives the app in-process (see benchmarks/harness.py) with generated users and
+forms, and reports throughput and latency percentiles for ingest, autofill at
+several key counts, listing and detail. The report is JSON and carries the git
+commit, so runs can be diffed across commits.
+
+Usage:
+    uv run python -m benchmarks.load --output load.json
+    uv run python -m benchmarks.load --users 50 --forms 20 --concurrency 16 --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import platform
+import random
+import subprocess
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import percentiles, write_results
+from benchmarks import harness
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def empty_autofill(response) -> bool:
+    return response.status_code == 200 and not response.json()["suggestions"]
+
+
+async def run_scenario(
+    calls: List[Callable[[], Awaitable]],
+    concurrency: int,
+    is_empty: Optional[Callable[[object], bool]] = None,
+) -> dict:
+    """`is_empty` flags successful responses that carry no result; they're reported apart from errors."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    empty = 0
+
+    async def timed(call):
+        nonlocal errors, empty
+        async with semaphore:
+            started = time.perf_counter()
+            response = await call()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            elif is_empty is not None and is_empty(response):
+                empty += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(c) for c in calls))
+    elapsed = time.perf_counter() - started
+    return {
+        **percentiles(latencies),
+        "errors": errors,
+        **({"empty": empty} if is_empty is not None else {}),
+        "throughput_rps": round(len(calls) / elapsed, 2) if elapsed else None,
+    }
+
+
+async def run(args) -> dict:
+    from benchmarks.workload import autofill_keys, generate_users
+
+    rng = random.Random(args.seed)
+    users = generate_users(args.users, args.forms, seed=args.seed)
+    results: Dict[str, dict] = {}
+
+    async with harness.local_app(mongo_uri=args.mongo_uri) as client:
+        headers = {u.user_id: await harness.mint_user(u.user_id) for u in users}
+
+        # ingest (includes the background vector ingestion, which runs inside the request under ASGITransport)
+        ingest_calls = [
+            (lambda u=u, f=f: client.post("/api/v1/submissions/", headers=headers[u.user_id], json={
+                "website": f.website, "path": f.path, "form_id": f.form_id, "data": f.data,
+            }))
+            for u in users for f in u.forms
+        ]
+        results["ingest"] = await run_scenario(ingest_calls, args.concurrency)
+
+        for n_keys in args.key_counts:
+            autofill_calls = [
+                (lambda u=u, keys=autofill_keys(u, n_keys, rng): client.post(
+                    "/api/v1/autofill", headers=headers[u.user_id], json={"keys": keys, "multiple": True},
+                ))
+                for u in users for _ in range(args.repeats)
+            ]
+            # keys are mostly ones the user has filled, so empty suggestions mean a degraded search
+            results[f"autofill_{n_keys}_keys"] = await run_scenario(autofill_calls, args.concurrency, empty_autofill)
+
+        list_calls = [
+            (lambda u=u: client.get("/api/v1/submissions/", headers=headers[u.user_id]))
+            for u in users for _ in range(args.repeats)
+        ]
+        results["list"] = await run_scenario(list_calls, args.concurrency)
+
+        # resolve ids once, then hit the detail endpoint
+        detail_targets = []
+        for u in users:
+            listing = (await client.get("/api/v1/submissions/", headers=headers[u.user_id])).json()
+            detail_targets.extend((u.user_id, s["id"]) for s in listing)
+        detail_calls = [
+            (lambda uid=uid, sid=sid: client.get(f"/api/v1/submissions/{sid}", headers=headers[uid]))
+            for uid, sid in rng.sample(detail_targets, k=min(len(detail_targets), len(users) * args.repeats))
+        ]
+        results["detail"] = await run_scenario(detail_calls, args.concurrency)
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--forms", type=int, default=10, help="forms per user")
+    parser.add_argument("--repeats", type=int, default=10, help="read requests per user per scenario")
+    parser.add_argument("--key-counts", default="1,5,10,20,40", help="autofill key counts to measure")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mongo-uri", help="use a real (local) mongo instead of mongomock-motor")
+    parser.add_argument("--qdrant-url", default=":memory:")
+    parser.add_argument("--output", help="also write the json report to this file")
+    args = parser.parse_args(argv)
+    args.key_counts = [int(k) for k in args.key_counts.split(",")]
+
+    harness.configure(mongo_uri=args.mongo_uri, qdrant_url=args.qdrant_url)
+    results = asyncio.run(run(args))
+
+    from app.services.vector_service import ACTIVE_MODEL
+    write_results({
+        "benchmark": "load",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "users": args.users,
+            "forms_per_user": args.forms,
+            "repeats": args.repeats,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "mongo": "real" if args.mongo_uri else "mongomock",
+            "qdrant": args.qdrant_url,
+            "embedding_model": ACTIVE_MODEL.name,
+        },
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Replays traffic recorded with CAPTURE_ENABLED (app/core/capture.py).
+
+Hashed users become minted benchmark users, hashed websites/paths/form ids are
+used as-is as opaque names, and submission values are regenerated from their
+recorded lengths. Requests are fired open-loop on the recorded schedule
+divided by --speedup (0 = back to back, bounded by --concurrency), and we
+report latency percentiles per endpoint and per autofill key count, plus how
+far the replay fell behind schedule.
+
+Usage:
+    uv run python -m benchmarks.replay captures/ --speedup 10 --prime --output replay.json
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.common import percentiles, write_results
+from benchmarks import harness
+from benchmarks.load import empty_autofill, git_commit
+
+KEY_BUCKETS = [(1, 1), (2, 5), (6, 10), (11, 20), (21, 40), (41, None)]
+
+
+def read_capture(paths: List[str]) -> List[dict]:
+    files: List[Path] = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.glob("capture-*.jsonl.gz")) if p.is_dir() else [p])
+
+    records = []
+    for f in files:
+        try:
+            with gzip.open(f, "rt") as fh:
+                for line in fh:
+                    records.append(json.loads(line))
+        except (EOFError, gzip.BadGzipFile):
+            # the writer may still have this file open; keep what we could read
+            pass
+    records.sort(key=lambda r: r["ts"])
+    return records
+
+
+def key_bucket(n: int) -> str:
+    for low, high in KEY_BUCKETS:
+        if n >= low and (high is None or n <= high):
+            return f"{low}+" if high is None else f"{low}-{high}"
+    return "0"
+
+
+def submission_body(record: dict) -> dict:
+    return {
+        "website": record["website"] or "unknown",
+        "path": record["path"] or "/",
+        "form_id": record["form_id"],
+        "data": {k: "x" * n for k, n in record["fields"].items()},
+    }
+
+
+def autofill_body(record: dict) -> dict:
+    body = {"keys": record["keys"], "multiple": record["multiple"], "limit": record["limit"]}
+    for field in ("website", "path", "form_id", "threshold"):
+        if record.get(field) is not None:
+            body[field] = record[field]
+    return body
+
+
+async def replay(client, records: List[dict], headers: Dict[str, dict], speedup: float, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    lag: List[float] = []
+    errors: Dict[str, int] = defaultdict(int)
+    empty: Dict[str, int] = defaultdict(int)
+
+    async def fire(record: dict, due: float):
+        async with semaphore:
+            now = time.perf_counter()
+            if due > now:
+                await asyncio.sleep(due - now)
+            lag.append(max(0.0, time.perf_counter() - due))
+
+            started = time.perf_counter()
+            if record["endpoint"] == "submission":
+                response = await client.post("/api/v1/submissions/", headers=headers[record["user"]], json=submission_body(record))
+                name = "submission"
+            else:
+                response = await client.post("/api/v1/autofill", headers=headers[record["user"]], json=autofill_body(record))
+                name = f"autofill_{key_bucket(len(record['keys']))}_keys"
+            latencies[name].append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors[name] += 1
+            elif record["endpoint"] == "autofill" and empty_autofill(response):
+                empty[name] += 1
+
+    t0 = records[0]["ts"]
+    start = time.perf_counter()
+    tasks = [
+        fire(r, start + ((r["ts"] - t0) / speedup if speedup > 0 else 0.0))
+        for r in records
+    ]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(records),
+        "elapsed_seconds": round(elapsed, 3),
+        "captured_seconds": round(records[-1]["ts"] - t0, 3),
+        "schedule_lag": percentiles(lag),
+        "endpoints": {
+            name: {**percentiles(samples), "errors": errors[name], "empty": empty[name]}
+            for name, samples in sorted(latencies.items())
+        },
+        "captured_latency": {
+            name: percentiles([r["duration_ms"] / 1000 for r in records if r["endpoint"] == name])
+            for name in ("submission", "autofill")
+        },
+    }
+
+
+async def run(args) -> dict:
+    records = read_capture(args.paths)
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        raise SystemExit("No capture records found")
+
+    async with harness.local_app(mongo_uri=args.mongo_uri) as client:
+        headers = {}
+        for user in {r["user"] for r in records}:
+            headers[user] = await harness.mint_user(f"replay-{user}")
+
+        if args.prime:
+            # load every captured form once so autofills have something to find
+            for r in records:
+                if r["endpoint"] == "submission":
+                    await client.post("/api/v1/submissions/", headers=headers[r["user"]], json=submission_body(r))
+
+        return await replay(client, records, headers, args.speedup, args.concurrency)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="capture files or directories")
+    parser.add_argument("--speedup", type=float, default=1.0, help="divide recorded gaps by this; 0 = no gaps")
+    parser.add_argument("--concurrency", type=int, default=64, help="max in-flight requests")
+    parser.add_argument("--limit", type=int, help="only replay the first N records")
+    parser.add_argument("--prime", action="store_true", help="ingest all captured submissions before replaying")
+    parser.add_argument("--mongo-uri", help="use a real (local) mongo instead of mongomock-motor")
+    parser.add_argument("--qdrant-url", default=":memory:")
+    parser.add_argument("--output", help="also write the json report to this file")
+    args = parser.parse_args(argv)
+
+    harness.configure(mongo_uri=args.mongo_uri, qdrant_url=args.qdrant_url)
+    results = asyncio.run(run(args))
+
+    write_results({
+        "benchmark": "replay",
+        "commit": git_commit(),
+        "config": {"paths": args.paths, "speedup": args.speedup, "concurrency": args.concurrency, "prime": args.prime},
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Compares the default response path (response_model validation + stdlib json)
+with app.core.responses.fast_response (trusted payload, orjson when installed,
+msgpack when asked for) on realistic payload sizes.
+
+Both paths are served by a tiny FastAPI app through httpx.ASGITransport so the
+numbers include everything the framework does after the handler returns.
+
+Usage:
+    uv run python -m benchmarks.serialization --output serialization.json
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from benchmarks.common import percentiles, use_offline_settings, write_results
+
+use_offline_settings()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from app.core import responses  # noqa: E402
+from app.models.schemas import AutofillResponse, SubmissionResponse  # noqa: E402
+
+
+def submission_doc(n_keys: int, values_per_key: int) -> dict:
+    data = {f"field_{k}": [f"value {k}-{v} " * 3 for v in range(values_per_key)] for k in range(n_keys)}
+    return {
+        "id": "3f1d2c4e-0000-4000-8000-000000000000",
+        "user_id": "bench-user",
+        "website": "shop.example.com",
+        "path": "/checkout",
+        "form_id": None,
+        "data": data,
+        "latest": {k: v[-1] for k, v in data.items()},
+        "timestamp": datetime.utcnow(),
+    }
+
+
+def autofill_payload(n_keys: int, websites: int, multiple: bool) -> dict:
+    suggestions = []
+    for w in range(websites):
+        fields = {
+            f"field_{k}": [f"value {k}-{i}" for i in range(3)] if multiple else f"value {k}"
+            for k in range(n_keys)
+        }
+        suggestions.append({"website": f"site-{w}.example.com", "fields": fields})
+    return {"suggestions": suggestions}
+
+
+def build_app(payloads: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default/submission/{name}", response_model=SubmissionResponse)
+    async def default_submission(name: str):
+        return payloads[name]
+
+    @app.get("/fast/submission/{name}", response_model=SubmissionResponse)
+    async def fast_submission(name: str, request: Request):
+        return responses.fast_response(request, payloads[name])
+
+    @app.get("/default/autofill/{name}", response_model=AutofillResponse)
+    async def default_autofill(name: str):
+        return payloads[name]
+
+    @app.get("/fast/autofill/{name}", response_model=AutofillResponse)
+    async def fast_autofill(name: str, request: Request):
+        return responses.fast_response(request, payloads[name])
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, url: str, iterations: int, headers: Optional[dict] = None) -> dict:
+    # warm up routing and encoders
+    for _ in range(5):
+        await client.get(url, headers=headers)
+    latencies: List[float] = []
+    size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        size = len(response.content)
+    return {**percentiles(latencies), "bytes": size}
+
+
+async def run(iterations: int) -> dict:
+    payloads = {
+        "submission_small": submission_doc(10, 2),
+        "submission_large": submission_doc(200, 10),
+        "autofill_10": autofill_payload(10, 3, multiple=False),
+        "autofill_40": autofill_payload(40, 3, multiple=False),
+        "autofill_40_multiple": autofill_payload(40, 3, multiple=True),
+    }
+    app = build_app(payloads)
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name in payloads:
+            kind = "submission" if name.startswith("submission") else "autofill"
+            results[name] = {
+                "default": await measure(client, f"/default/{kind}/{name}", iterations),
+                "fast_json": await measure(client, f"/fast/{kind}/{name}", iterations),
+            }
+            if responses.msgpack is not None:
+                results[name]["fast_msgpack"] = await measure(
+                    client, f"/fast/{kind}/{name}", iterations, headers={"Accept": "application/msgpack"},
+                )
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", help="also write the json report to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.iterations))
+    write_results({
+        "benchmark": "serialization",
+        "orjson": responses.orjson is not None,
+        "msgpack": responses.msgpack is not None,
+        "iterations": args.iterations,
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
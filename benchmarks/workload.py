@@ -0,0 +1,66 @@
+"""
+Synthetic but realistic workload: users fill a handful of sites, each with a few
+forms drawn from a shared field-name vocabulary (with the spelling variants real
+sites use), and autofill asks for keys the user has mostly seen before.
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from benchmarks.common import DATA_DIR
+
+SITES = ["shop", "bank", "airline", "jobs", "clinic", "school", "hotel", "gym", "insurance", "news", "forum", "events"]
+PATHS = ["/", "/checkout", "/signup", "/profile", "/apply", "/contact"]
+
+
+def field_vocabulary() -> List[str]:
+    with open(DATA_DIR / "field_names.json") as f:
+        dataset = json.load(f)
+    names = set(dataset["stored_keys"])
+    names.update(q["query"] for q in dataset["queries"])
+    return sorted(names)
+
+
+@dataclass
+class Form:
+    website: str
+    path: str
+    form_id: Optional[str]
+    data: Dict[str, str]
+
+
+@dataclass
+class User:
+    user_id: str
+    forms: List[Form] = field(default_factory=list)
+
+    @property
+    def keys(self) -> List[str]:
+        return sorted({k for form in self.forms for k in form.data})
+
+
+def generate_users(n_users: int, forms_per_user: int, seed: int = 0) -> List[User]:
+    rng = random.Random(seed)
+    vocab = field_vocabulary()
+    users = []
+    for u in range(n_users):
+        user = User(user_id=f"bench-user-{u}")
+        for f in range(forms_per_user):
+            site = f"{rng.choice(SITES)}-{rng.randint(0, 50)}.example.com"
+            keys = rng.sample(vocab, k=rng.randint(3, 15))
+            user.forms.append(Form(
+                website=site,
+                path=rng.choice(PATHS),
+                form_id=rng.choice([None, None, f"form-{f}"]),
+                data={k: f"{k.lower().replace(' ', '_')}-{u}-{rng.randint(0, 3)}" for k in keys},
+            ))
+        users.append(user)
+    return users
+
+
+def autofill_keys(user: User, n_keys: int, rng: random.Random, known_share: float = 0.8) -> List[str]:
+    """mostly keys the user has filled before, plus some unseen variants."""
+    vocab = field_vocabulary()
+    known = user.keys or vocab
+    return [rng.choice(known) if rng.random() < known_share else rng.choice(vocab) for _ in range(n_keys)]
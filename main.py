@@ -1,72 +1,44 @@
+import asyncio
 import logging
+import time
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.staticfiles import StaticFiles
-from app.api.routers import submissions, search, auth
-from app.core.database import db
+from app.api.routers import submissions, search, auth, sync, admin
+from app.core import capture
+from app.core.config import settings
+from app.core.database import get_db, ping_mongo, ping_qdrant, close_clients
+from app.core.http import close_http_client
+from app.core.profiling import ProfilingMiddleware
+from app.core.responses import check_encoders
+from app.core.maintenance import run_startup_maintenance, run_key_vector_backfill
+from app.services import vector_service
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # migrate: backfill path and form_id (handles both missing and null)
-    await db.submissions.update_many(
-        {"path": {"$in": [None]}},
-        {"$set": {"path": "/"}}
-    )
-    await db.submissions.update_many(
-        {"path": {"$exists": False}},
-        {"$set": {"path": "/"}}
-    )
-    await db.submissions.update_many(
-        {"form_id": {"$exists": False}},
-        {"$set": {"form_id": None}}
-    )
+    check_encoders()
+    await run_startup_maintenance(get_db())
 
-    # migrate: convert all string data values to single-element arrays
-    async for doc in db.submissions.find({"data": {"$exists": True}}):
-        updates = {}
-        if doc.get("data"):
-            for key, value in doc["data"].items():
-                if not isinstance(value, list):
-                    updates[f"data.{key}"] = [str(value)]
-        if updates:
-            await db.submissions.update_one(
-                {"_id": doc["_id"]},
-                {"$set": updates}
-            )
+    # load the embedding model before accepting traffic
+    if settings.WARM_UP_EMBEDDER:
+        try:
+            await vector_service.warm_up()
+        except Exception as e:
+            logger.warning(f"Embedder warm-up failed, /ready will report it: {e}")
 
-    # migrate: deduplicate docs that share the same composite key
-    pipeline = [
-        {"$group": {
-            "_id": {"user_id": "$user_id", "website": "$website", "path": "$path", "form_id": "$form_id"},
-            "docs": {"$push": {"_id": "$_id", "data": "$data"}},
-            "count": {"$sum": 1}
-        }},
-        {"$match": {"count": {"$gt": 1}}}
-    ]
-    async for group in db.submissions.aggregate(pipeline):
-        docs = group["docs"]
-        keep = docs[0]
-        for dup in docs[1:]:
-            if dup.get("data"):
-                for key, value in dup["data"].items():
-                    vals = value if isinstance(value, list) else [str(value)]
-                    await db.submissions.update_one(
-                        {"_id": keep["_id"]},
-                        {"$addToSet": {f"data.{key}": {"$each": vals}}}
-                    )
-            await db.submissions.delete_one({"_id": dup["_id"]})
-        logger.info(f"Merged {len(docs) - 1} duplicate(s) for {group['_id']}")
-
-    # now safe to create the unique index
-    await db.submissions.create_index(
-        [("user_id", 1), ("website", 1), ("path", 1), ("form_id", 1)],
-        unique=True,
-        name="unique_form_submission",
-    )
+    # per_key storage is backfilled from mongo in the background, by one worker
+    backfill = None
+    if vector_service.STORAGE_MODE == vector_service.PER_KEY:
+        backfill = asyncio.create_task(run_key_vector_backfill(get_db()))
     yield
+    if backfill is not None and not backfill.done():
+        backfill.cancel()
+    await asyncio.to_thread(capture.close)
+    await close_clients()
+    await close_http_client()
 
 app = FastAPI(
     title="Semantic Search Autofill API",
@@ -78,6 +50,11 @@ app = FastAPI(
 app.include_router(submissions.router, prefix="/api/v1/submissions")
 app.include_router(search.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1/auth")
+app.include_router(sync.router, prefix="/api/v1/sync")
+app.include_router(admin.router, prefix="/api/v1/admin")
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 app.mount("/static", StaticFiles(directory=Path(__file__).parent / "app" / "static"), name="static")
 
@@ -85,3 +62,35 @@ app.mount("/static", StaticFiles(directory=Path(__file__).parent / "app" / "stat
 async def health_check():
     return {"status": "healthy"}
 
+async def _probe(check) -> dict:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), timeout=settings.READINESS_TIMEOUT_SECONDS)
+        result = {"ok": True}
+    except Exception as e:
+        result = {"ok": False, "error": str(e) or type(e).__name__}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+@app.get("/ready", tags=["Health"])
+async def readiness_check(response: Response):
+    """
+    Readiness probe: unlike /health, only passes once this worker can actually serve autofill.
+    """
+    mongo, qdrant = await asyncio.gather(_probe(ping_mongo), _probe(ping_qdrant))
+    load_seconds = vector_service.embedder_load_seconds()
+    loaded = vector_service.embedder_loaded()
+    # without warm-up the model loads on the first autofill, so it can't gate readiness
+    embedder = {
+        "ok": loaded or not settings.WARM_UP_EMBEDDER,
+        "required": settings.WARM_UP_EMBEDDER,
+        "loaded": loaded,
+        "model": vector_service.ACTIVE_MODEL.name,
+        "load_ms": round(load_seconds * 1000, 2) if load_seconds is not None else None,
+    }
+    checks = {"mongo": mongo, "qdrant": qdrant, "embedder": embedder}
+    ready = all(c["ok"] for c in checks.values())
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "not_ready", "checks": checks}
+
@@ -0,0 +1,22 @@
+import os
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# settings are read at import time; these let `app` import without a .env
+for key, value in {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "QDRANT_URL": ":memory:",
+    "QDRANT_API_KEY": "",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "API_BASE_URL": "http://localhost:8001",
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["fl0_test"]
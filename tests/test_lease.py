@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.core.lease import Lease, LeaseUnavailable, is_done, run_once
+
+
+def test_contention(db):
+    async def scenario():
+        first = Lease(db, "job", ttl_seconds=5, owner="a")
+        second = Lease(db, "job", ttl_seconds=5, owner="b")
+        assert await first.acquire()
+        assert not await second.acquire()
+        with pytest.raises(LeaseUnavailable):
+            async with Lease(db, "job", ttl_seconds=5, owner="c"):
+                pass
+
+        # re-acquiring our own lease is fine
+        assert await first.acquire()
+        await first.release()
+        assert await second.acquire()
+        await second.release()
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_taken_over(db):
+    async def scenario():
+        dead = Lease(db, "job", ttl_seconds=0.2, owner="a")
+        assert await dead.acquire()
+        # the holder dies: nothing renews it anymore
+        dead._heartbeat_task.cancel()
+
+        other = Lease(db, "job", ttl_seconds=5, owner="b")
+        assert not await other.acquire()
+        await asyncio.sleep(0.3)
+        assert await other.acquire()
+        assert not await dead.renew()
+        await other.release()
+
+    asyncio.run(scenario())
+
+
+def test_lease_is_lost_when_renewals_keep_failing(db):
+    async def scenario():
+        lease = Lease(db, "job", ttl_seconds=0.3, owner="a")
+        assert await lease.acquire()
+
+        async def unreachable():
+            raise ConnectionError("mongo unreachable")
+
+        lease.renew = unreachable
+        await asyncio.sleep(0.15)
+        # within the ttl a failed renewal is only a warning
+        assert lease.held and not lease.lost
+        await asyncio.sleep(0.35)
+        assert lease.lost and not lease.held and lease.expired
+        await lease.release()
+
+    asyncio.run(scenario())
+
+
+def test_run_once_writes_marker_once(db):
+    async def scenario():
+        runs = []
+
+        async def task():
+            runs.append(1)
+
+        assert await run_once(db, "maintenance", "v1", task, ttl_seconds=5)
+        assert await run_once(db, "maintenance", "v1", task, ttl_seconds=5)
+        assert runs == [1]
+        assert await is_done(db, "maintenance", "v1")
+        assert not await is_done(db, "maintenance", "v2")
+
+    asyncio.run(scenario())
+
+
+def test_run_once_skips_marker_after_takeover(db):
+    async def scenario():
+        async def task():
+            # our lease expired mid-task and another process took it over
+            await db.leases.update_one({"_id": "maintenance"}, {"$set": {"owner": "other"}})
+
+        assert not await run_once(db, "maintenance", "v1", task, ttl_seconds=5, wait_timeout=0)
+        assert not await is_done(db, "maintenance", "v1")
+
+    asyncio.run(scenario())
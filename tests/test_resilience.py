@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.core.resilience import CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded
+
+
+async def _ok():
+    return "ok"
+
+
+async def _fail():
+    raise ConnectionError("down")
+
+
+async def _slow():
+    await asyncio.sleep(1)
+
+
+def test_opens_on_failure_rate_after_min_calls():
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=4, open_seconds=60)
+    for _ in range(3):
+        breaker.record_failure()
+    # every call failed, but there are too few to judge
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=4, open_seconds=60)
+    for _ in range(4):
+        breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    # 2 of 6
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    breaker.record_failure()
+    # 4 of 8
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_after_open_seconds():
+    async def scenario():
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.05)
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_ok, timeout=1)
+
+        await asyncio.sleep(0.06)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # a failed trial opens it again
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail, timeout=1)
+        assert breaker.state == CircuitBreaker.OPEN
+
+        await asyncio.sleep(0.06)
+        assert breaker.allow()
+        # only half_open_calls trials at a time
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_trial_releases_its_slot():
+    async def scenario():
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.01)
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+
+        trial = asyncio.create_task(breaker.call(_slow, timeout=5))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert await breaker.call(_ok, timeout=1) == "ok"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_deadline_capped_timeout_is_not_a_failure():
+    async def scenario():
+        breaker = CircuitBreaker("test", min_calls=1)
+        with pytest.raises(DeadlineExceeded):
+            await breaker.call(_slow, timeout=5, deadline=Deadline(0.02))
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert not breaker._window
+
+        with pytest.raises(DeadlineExceeded):
+            await breaker.call(_ok, timeout=5, deadline=Deadline(0))
+
+        # the full timeout running out is the dependency's fault
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(_slow, timeout=0.02, deadline=Deadline(5))
+        assert breaker.state == CircuitBreaker.OPEN
+
+    asyncio.run(scenario())
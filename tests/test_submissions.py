@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.routers import submissions
+from app.core.auth import get_current_user
+from app.core.database import get_database
+
+
+def _client(db) -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(submissions.router, prefix="/api/v1/submissions")
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "u1"}
+    app.dependency_overrides[get_database] = lambda: db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def _insert(db):
+    await db.submissions.insert_one({
+        "id": "s1",
+        "user_id": "u1",
+        "website": "a.com",
+        "path": "/",
+        "form_id": None,
+        "data": {"email": ["old@x", "new@x"], "name": ["Bo"], "$x": ["dollar"]},
+        "version": 3,
+        "timestamp": datetime(2026, 1, 1),
+    })
+
+
+def test_detail_fields_and_latest_only(db):
+    async def scenario():
+        await _insert(db)
+        async with _client(db) as client:
+            full = (await client.get("/api/v1/submissions/s1")).json()
+            assert full["data"]["email"] == ["old@x", "new@x"]
+            assert full["latest"]["name"] == "Bo"
+
+            picked = (await client.get("/api/v1/submissions/s1", params={"fields": "email,missing"})).json()
+            assert picked["data"] == {"email": ["old@x", "new@x"]}
+            assert picked["latest"] == {"email": "new@x"}
+
+            latest = (await client.get("/api/v1/submissions/s1", params={"latest_only": "true"})).json()
+            assert latest["data"] == {}
+            assert latest["latest"] == {"email": "new@x", "name": "Bo", "$x": "dollar"}
+
+    asyncio.run(scenario())
+
+
+def test_detail_fields_never_become_paths(db):
+    async def scenario():
+        await _insert(db)
+        async with _client(db) as client:
+            for fields in ("email,email.x", "$x", "data.email"):
+                response = await client.get("/api/v1/submissions/s1", params={"fields": fields})
+                assert response.status_code == 200, fields
+            dollar = (await client.get("/api/v1/submissions/s1", params={"fields": "$x"})).json()
+            assert dollar["data"] == {"$x": ["dollar"]}
+
+    asyncio.run(scenario())
+
+
+def test_detail_if_none_match(db):
+    async def scenario():
+        await _insert(db)
+        async with _client(db) as client:
+            first = await client.get("/api/v1/submissions/s1", params={"fields": "email"})
+            etag = first.headers["etag"]
+            assert first.headers["vary"] == "Accept"
+
+            same = await client.get("/api/v1/submissions/s1", params={"fields": "email"}, headers={"If-None-Match": etag})
+            assert same.status_code == 304
+            assert same.headers["etag"] == etag
+
+            # another view of the same version is a different body
+            other = await client.get("/api/v1/submissions/s1", headers={"If-None-Match": etag})
+            assert other.status_code == 200
+            assert other.headers["etag"] != etag
+
+            await db.submissions.update_one({"id": "s1"}, {"$set": {"version": 4}})
+            changed = await client.get("/api/v1/submissions/s1", params={"fields": "email"}, headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+
+            missing = await client.get("/api/v1/submissions/nope", headers={"If-None-Match": etag})
+            assert missing.status_code == 404
+
+    asyncio.run(scenario())
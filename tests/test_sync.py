@@ -0,0 +1,73 @@
+import asyncio
+
+from app.services import sync_service
+
+
+async def _write(db, user_id, form, value, version):
+    await db.submissions.update_one(
+        {"user_id": user_id, "website": form},
+        {
+            "$setOnInsert": {"id": form, "user_id": user_id, "website": form},
+            "$addToSet": {"data.email": value},
+            "$max": {"version": version},
+        },
+        upsert=True,
+    )
+
+
+async def _sync(db, user_id, cursor=None):
+    return await sync_service.build_sync(db, user_id, cursor=cursor, embeddings=False)
+
+
+def test_delta_sync_keeps_out_of_order_commits(db):
+    async def scenario():
+        first = await _sync(db, "u1")
+
+        # A takes the lower version but commits after B
+        slow = sync_service.versioned_write(db, "u1")
+        slow_version = await slow.__aenter__()
+        async with sync_service.versioned_write(db, "u1") as fast_version:
+            await _write(db, "u1", "b.com", "b@x", fast_version)
+        assert fast_version > slow_version
+
+        middle = await _sync(db, "u1", first["cursor"])
+        assert [s["id"] for s in middle["submissions"]] == ["b.com"]
+        # B is sent, but the cursor must not move past A's version while A is in flight
+        assert middle["cursor"] < slow_version
+
+        await _write(db, "u1", "a.com", "a@x", slow_version)
+        await slow.__aexit__(None, None, None)
+
+        last = await _sync(db, "u1", middle["cursor"])
+        assert {s["id"] for s in last["submissions"]} == {"a.com", "b.com"}
+        assert last["cursor"] == fast_version
+
+    asyncio.run(scenario())
+
+
+def test_slower_writer_does_not_lower_version(db):
+    async def scenario():
+        await _write(db, "u1", "a.com", "a@x", 5)
+        await _write(db, "u1", "a.com", "a2@x", 3)
+        doc = await db.submissions.find_one({"id": "a.com"})
+        assert doc["version"] == 5
+
+    asyncio.run(scenario())
+
+
+def test_deletions_are_versioned(db):
+    async def scenario():
+        async with sync_service.versioned_write(db, "u1") as version:
+            await _write(db, "u1", "a.com", "a@x", version)
+        cursor = (await _sync(db, "u1"))["cursor"]
+
+        await db.submissions.delete_one({"id": "a.com"})
+        await sync_service.record_deletion(db, "u1", "a.com")
+
+        delta = await _sync(db, "u1", cursor)
+        assert delta["deleted"] == ["a.com"]
+        assert delta["cursor"] == cursor + 1
+        counter = await db.sync_counters.find_one({"_id": "u1"})
+        assert counter["inflight"] == []
+
+    asyncio.run(scenario())